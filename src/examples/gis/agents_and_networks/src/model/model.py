@@ -41,6 +41,16 @@ def get_total_friendships_by_type(model, friendship_type: str) -> int:
     return sum(num_friendships)
 
 
+COMMUTER_SETTINGS = (
+    "MIN_FRIENDS",
+    "MAX_FRIENDS",
+    "HAPPINESS_INCREASE",
+    "HAPPINESS_DECREASE",
+    "SPEED",
+    "CHANCE_NEW_FRIEND",
+)
+
+
 class AgentsAndNetworks(mesa.Model):
     running: bool
     schedule: mesa.time.RandomActivation
@@ -126,6 +136,20 @@ class AgentsAndNetworks(mesa.Model):
         )
         self.datacollector.collect(self)
 
+    def __getstate__(self) -> dict:
+        # The commuter settings are class attributes of Commuter, so they are
+        # not pickled with the commuters.
+        state = self.__dict__.copy()
+        state["commuter_settings"] = {
+            name: getattr(Commuter, name) for name in COMMUTER_SETTINGS
+        }
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.pop("commuter_settings").items():
+            setattr(Commuter, name, value)
+        self.__dict__.update(state)
+
     def _create_commuters(self) -> None:
         for _ in range(self.num_commuters):
             random_home = self.space.get_random_home()
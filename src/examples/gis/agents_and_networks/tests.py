@@ -0,0 +1,38 @@
+from functools import partial
+
+from examples_shared.checkpoint import assert_checkpoint_resumes_identically
+from src.agent.commuter import Commuter
+from src.model.model import AgentsAndNetworks
+
+
+def make_model(commuter_speed):
+    return AgentsAndNetworks(
+        campus="ub",
+        data_crs="epsg:4326",
+        buildings_file="data/ub/UB_bld.zip",
+        walkway_file="data/ub/UB_walkway_line.zip",
+        lakes_file="data/ub/hydrop.zip",
+        rivers_file="data/ub/hydrol.zip",
+        driveway_file="data/ub/UB_Rds.zip",
+        num_commuters=10,
+        commuter_speed=commuter_speed,
+    )
+
+
+def commuter_states(model):
+    return sorted(
+        (a.unique_id, a.status, a.geometry.wkt, a.num_home_friends, a.num_work_friends)
+        for a in model.schedule.agents
+    )
+
+
+def test_checkpoint_resumes_identically():
+    # A new model with other settings overwrites the Commuter class
+    # attributes, which the checkpoint has to set back.
+    model, restored = assert_checkpoint_resumes_identically(
+        partial(make_model, commuter_speed=0.5),
+        steps=50,
+        before_load=partial(make_model, commuter_speed=1.0),
+    )
+    assert Commuter.SPEED == 0.5 * 300.0
+    assert commuter_states(restored) == commuter_states(model)
@@ -0,0 +1,15 @@
+from functools import partial
+
+import numpy as np
+from examples_shared.checkpoint import assert_checkpoint_resumes_identically
+from rainfall.model import Rainfall
+
+
+def test_checkpoint_resumes_identically():
+    model, restored = assert_checkpoint_resumes_identically(
+        partial(Rainfall, rain_rate=100, num_steps=10), steps=5
+    )
+    np.testing.assert_array_equal(
+        restored.space.raster_layer.get_raster("water_level"),
+        model.space.raster_layer.get_raster("water_level"),
+    )
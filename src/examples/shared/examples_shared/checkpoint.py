@@ -0,0 +1,129 @@
+"""
+Checkpoints of a running model, to continue a long run after it was stopped.
+
+A checkpoint holds the pickled model, with its agents, schedule, random
+generator and DataCollector, together with the states of the global random
+and numpy.random generators, which some models draw from. A model restored
+from a checkpoint steps on exactly as the saved one would have.
+
+Everything the model holds must pickle: DataCollector reporters have to be
+module-level functions (or partials of them) rather than lambdas, and agent
+reporters given as attribute names are wrapped by mesa in local functions,
+so they have to be passed as functions as well.
+"""
+
+import os
+import pickle
+import random
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# thread writing the latest checkpoint of each path
+_writers = {}
+
+
+def save_checkpoint(model, path):
+    """
+    Save a checkpoint of model to path
+
+    The model is pickled before returning, so it can be stepped on right
+    away; the file is written by a background thread, which is returned.
+    The file is replaced only once fully written, so a run stopped while
+    saving keeps its previous checkpoint.
+    """
+    path = Path(path)
+    data = pickle.dumps(
+        {
+            "model": model,
+            "random": random.getstate(),
+            "np_random": np.random.get_state(),
+        },
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    _wait(path)
+    writer = threading.Thread(target=_write, args=(path, data))
+    writer.start()
+    _writers[path] = writer
+    return writer
+
+
+def _wait(path):
+    writer = _writers.pop(path, None)
+    if writer is not None:
+        writer.join()
+
+
+def _write(path, data):
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+
+
+def load_checkpoint(path):
+    """
+    Load the checkpoint at path
+
+    The global random and numpy.random generators are set back to their
+    state when the checkpoint was saved.
+
+    returns the model
+    """
+    path = Path(path)
+    _wait(path)
+    with open(path, "rb") as f:
+        checkpoint = pickle.load(f)
+    random.setstate(checkpoint["random"])
+    np.random.set_state(checkpoint["np_random"])
+    return checkpoint["model"]
+
+
+def assert_checkpoint_resumes_identically(model_factory, steps, before_load=None):
+    """
+    Check that a model restored from a checkpoint steps on as the saved one
+
+    A model from model_factory() is run for steps, saved, and run for steps
+    more; the checkpoint is then loaded and run for as many steps. Both runs
+    must end with the same global random and numpy.random states and, if
+    the model has a DataCollector, the same collected data. before_load, if
+    given, is called just before loading, e.g. to build another model that
+    changes state shared with the saved one.
+
+    returns the model and the restored one, for checks of their own state
+    """
+    model = model_factory()
+    for _ in range(steps):
+        model.step()
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "model.ckpt"
+        save_checkpoint(model, path).join()
+        for _ in range(steps):
+            model.step()
+        random_state = random.getstate()
+        np_random_state = np.random.get_state()
+        if before_load is not None:
+            before_load()
+        restored = load_checkpoint(path)
+    for _ in range(steps):
+        restored.step()
+
+    assert random.getstate() == random_state
+    np.testing.assert_equal(np.random.get_state(), np_random_state)
+    datacollector = getattr(model, "datacollector", None)
+    if datacollector is not None:
+        pd.testing.assert_frame_equal(
+            restored.datacollector.get_model_vars_dataframe(),
+            datacollector.get_model_vars_dataframe(),
+        )
+        if datacollector.agent_reporters:
+            pd.testing.assert_frame_equal(
+                restored.datacollector.get_agent_vars_dataframe(),
+                datacollector.get_agent_vars_dataframe(),
+            )
+    return model, restored
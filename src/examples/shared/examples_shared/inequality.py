@@ -0,0 +1,91 @@
+"""
+Inequality metrics for the Boltzmann wealth models.
+
+gini() computes the Gini coefficient from scratch with a NumPy sort.
+WealthHistogram keeps the number of agents at each integer wealth level up to
+date as money changes hands, so the Gini coefficient can be read off in time
+proportional to the number of wealth levels instead of re-sorting every
+agent's wealth at each step.
+"""
+
+import numpy as np
+
+
+def gini(wealths):
+    """Gini coefficient of a sequence of wealth values."""
+    x = np.sort(np.asarray(wealths, dtype=np.float64))
+    N = len(x)
+    B = np.dot(x, np.arange(N, 0, -1)) / (N * x.sum())
+    return float(1 + (1 / N) - 2 * B)
+
+
+class WealthHistogram:
+    """Number of agents at each integer wealth level.
+
+    Wealth must be a non-negative integer. Call transfer() (or move() for
+    changes that are not a one-unit exchange) whenever an agent's wealth
+    changes, before applying the change to the agent.
+    """
+
+    def __init__(self, wealths=()):
+        wealths = np.fromiter(wealths, dtype=np.int64)
+        self.counts = np.bincount(wealths).tolist()
+        self.num_agents = len(wealths)
+
+    def add(self, wealth):
+        """Add an agent with the given wealth."""
+        if wealth >= len(self.counts):
+            self.counts.extend([0] * (wealth + 1 - len(self.counts)))
+        self.counts[wealth] += 1
+        self.num_agents += 1
+
+    def remove(self, wealth):
+        """Remove an agent with the given wealth."""
+        self.counts[wealth] -= 1
+        self.num_agents -= 1
+
+    def move(self, old_wealth, new_wealth):
+        """Record that an agent's wealth went from old_wealth to new_wealth."""
+        self.remove(old_wealth)
+        self.add(new_wealth)
+
+    def transfer(self, giver_wealth, receiver_wealth):
+        """Record one unit of money passing from giver to receiver.
+
+        Args:
+            giver_wealth, receiver_wealth: The two agents' wealth before the
+                                           transfer.
+        """
+        self.move(giver_wealth, giver_wealth - 1)
+        self.move(receiver_wealth, receiver_wealth + 1)
+
+    def update(self, old_wealths, new_wealths):
+        """Record that the agents with old_wealths now have new_wealths.
+
+        Args:
+            old_wealths, new_wealths: Integer arrays of the same agents' wealth
+                                      before and after a batch of changes.
+        """
+        change = np.bincount(new_wealths, minlength=len(self.counts))
+        old_counts = np.bincount(old_wealths)
+        change[: len(old_counts)] -= old_counts
+        if len(change) > len(self.counts):
+            self.counts.extend([0] * (len(change) - len(self.counts)))
+        for level in np.flatnonzero(change):
+            self.counts[level] += int(change[level])
+
+    def gini(self):
+        """Gini coefficient of the recorded wealth distribution.
+
+        Same value as gini() on the individual wealths: each wealth level is
+        a run of equal values in the sorted order, so its share of the
+        rank-weighted sum has a closed form.
+        """
+        counts = np.asarray(self.counts, dtype=np.float64)
+        levels = np.arange(len(counts), dtype=np.float64)
+        N = self.num_agents
+        # Rank (in ascending order) of the first agent at each wealth level.
+        starts = np.cumsum(counts) - counts
+        rank_weights = counts * (N - starts) - counts * (counts - 1) / 2
+        B = np.dot(levels, rank_weights) / (N * np.dot(levels, counts))
+        return float(1 + (1 / N) - 2 * B)
@@ -0,0 +1,127 @@
+"""
+Helpers for agents on a lattice.
+"""
+
+import functools
+import itertools
+
+import numpy as np
+
+
+class NeighborCacheMixin:
+    """
+    Mixin for agents that never move once placed on model.grid.
+
+    Their neighbors are looked up on the grid the first time they are used
+    and kept, so later lookups are attribute reads. Set moore = False on the
+    agent class for a von Neumann neighborhood.
+    """
+
+    moore = True
+
+    @functools.cached_property
+    def neighbors(self):
+        """The agents around this one, excluding it."""
+        return tuple(self.model.grid.iter_neighbors(self.pos, self.moore))
+
+    @functools.cached_property
+    def neighborhood(self):
+        """The agents around this one, including it."""
+        return tuple(
+            self.model.grid.iter_neighbors(self.pos, self.moore, include_center=True)
+        )
+
+    def forget_neighbors(self):
+        """Drop the kept neighbors, so they are looked up again on next use."""
+        self.__dict__.pop("neighbors", None)
+        self.__dict__.pop("neighborhood", None)
+
+
+class ArrayGridView:
+    """
+    Read view of a model that keeps its cells in arrays instead of agents on
+    a mesa grid, offering the parts of the mesa grid API used by the
+    visualizations and the tests.
+
+    cell_view(pos) returns a read-only stand-in for the agent at pos, built
+    from the arrays as they are at the time of the call, or None for an empty
+    cell. Such a model keeps no agents on its schedule, but still steps it to
+    advance the model clock.
+    """
+
+    def __init__(self, width, height, cell_view, torus=False):
+        self.width = width
+        self.height = height
+        self.cell_view = cell_view
+        self.torus = torus
+
+    def __getitem__(self, pos):
+        return self.cell_view(pos)
+
+    def coord_iter(self):
+        for pos in itertools.product(range(self.width), range(self.height)):
+            yield self[pos], pos
+
+    def iter_cell_list_contents(self, cell_list):
+        return (agent for agent in map(self.cell_view, cell_list) if agent is not None)
+
+    def get_cell_list_contents(self, cell_list):
+        return list(self.iter_cell_list_contents(cell_list))
+
+
+class NeighborTypeCounts:
+    """
+    Number of agents of each type within radius of every cell of a toroidal
+    width x height grid, and a pool of the cells that are empty.
+
+    Both are updated as agents are placed and moved, so an agent counts the
+    agents of its type around it with one lookup, and a move to a random
+    empty cell costs the same however many cells are empty. The cells around
+    a position are found from one offset array, wrapped around the edges,
+    rather than kept for every cell.
+    """
+
+    def __init__(self, width, height, radius=1, num_types=2):
+        self.width = width
+        self.height = height
+        # Indexed by (type, x, y).
+        self.counts = np.zeros((num_types, width, height), dtype=np.int32)
+        # The empty cells, in no particular order.
+        self.empty_cells = []
+        # Offsets to the cells within radius (Moore), each cell once even
+        # when the radius wraps around the grid, and the centre left out.
+        offsets = {
+            (dx % width, dy % height)
+            for dx in range(-radius, radius + 1)
+            for dy in range(-radius, radius + 1)
+        }
+        offsets.discard((0, 0))
+        self.dx, self.dy = np.array(sorted(offsets)).reshape(-1, 2).T
+
+    def neighborhood(self, pos):
+        """Return the cells within radius of pos, pos excluded, as x and y arrays."""
+        x, y = pos
+        return (x + self.dx) % self.width, (y + self.dy) % self.height
+
+    def count(self, agent_type, pos):
+        """Return the number of agents of agent_type within radius of pos."""
+        return self.counts[(agent_type, *pos)]
+
+    def place(self, agent_type, pos):
+        """Record an agent of agent_type placed at pos."""
+        self.counts[(agent_type, *self.neighborhood(pos))] += 1
+
+    def move_to_empty(self, agent_type, pos, random):
+        """
+        Move an agent of agent_type from pos to an empty cell picked with
+        random, and return that cell. The cell left takes its place in
+        empty_cells.
+        """
+        if not self.empty_cells:
+            raise Exception("ERROR: No empty cells")
+        i = random.randrange(len(self.empty_cells))
+        new_pos = self.empty_cells[i]
+        self.empty_cells[i] = pos
+        self.counts[(agent_type, *self.neighborhood(pos))] -= 1
+        self.counts[(agent_type, *self.neighborhood(new_pos))] += 1
+        return new_pos
@@ -0,0 +1,64 @@
+"""
+Times steps of a model whose agents use NeighborCacheMixin, with their
+neighbors kept after the first lookup against looking them up on the grid
+at every step.
+
+Run from the directory of an example, naming its model class and any extra
+keyword arguments, e.g.:
+
+    python -m examples_shared.neighbor_benchmark color_patches.model:ColorPatches
+    python -m examples_shared.neighbor_benchmark pd_grid.model:PdGrid schedule_type=Simultaneous
+"""
+
+import argparse
+import importlib
+import time
+
+from .lattice import NeighborCacheMixin
+
+
+def load_model_class(spec):
+    """Return the class named by a "package.module:Class" spec."""
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def time_step(model, forget_neighbors):
+    if forget_neighbors:
+        for agent in model.schedule.agents:
+            if isinstance(agent, NeighborCacheMixin):
+                agent.forget_neighbors()
+    start = time.perf_counter()
+    model.step()
+    return time.perf_counter() - start
+
+
+def benchmark(model_class, size=100, steps=10, **kwargs):
+    """
+    Return the mean step time of a size x size model_class(**kwargs),
+    looking neighbors up at every step and keeping them.
+    """
+    timings = {}
+    for forget_neighbors in (True, False):
+        model = model_class(size, size, **kwargs)
+        model.step()
+        timings[forget_neighbors] = (
+            sum(time_step(model, forget_neighbors) for _ in range(steps)) / steps
+        )
+    return timings[True], timings[False]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("model", help='model class, as "package.module:Class"')
+    parser.add_argument("kwargs", nargs="*", help="NAME=VALUE model arguments")
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args()
+
+    kwargs = dict(kwarg.split("=", 1) for kwarg in args.kwargs)
+    lookup, cached = benchmark(
+        load_model_class(args.model), args.size, args.steps, **kwargs
+    )
+    print(f"grid lookup: {lookup * 1000:.1f} ms/step")
+    print(f"cached:      {cached * 1000:.1f} ms/step ({lookup / cached:.2f}x)")
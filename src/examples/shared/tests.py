@@ -0,0 +1,21 @@
+import numpy as np
+from examples_shared.inequality import WealthHistogram, gini
+
+
+def test_wealth_histogram_gini_matches_direct_gini():
+    rng = np.random.default_rng(0)
+    wealth = rng.integers(1, 5, size=200)
+    histogram = WealthHistogram(wealth)
+    for _ in range(50):
+        old_wealth = wealth.copy()
+        for _ in range(20):
+            giver, receiver = rng.choice(len(wealth), size=2, replace=False)
+            if wealth[giver] > 0:
+                histogram.transfer(int(wealth[giver]), int(wealth[receiver]))
+                wealth[giver] -= 1
+                wealth[receiver] += 1
+        assert np.isclose(histogram.gini(), gini(wealth))
+        # A batch of changes recorded at once gives the same counts.
+        batch = WealthHistogram(old_wealth)
+        batch.update(old_wealth, wealth)
+        assert np.isclose(batch.gini(), gini(wealth))
@@ -1,29 +1,101 @@
+import base64
+import json
+
 import mesa
+import numpy as np
+
+# Types the browser decodes the portrayal indices into, smallest first.
+STYLE_TYPES = ("uint8", "uint16", "uint32")
+
+
+def encode_array(array):
+    """
+    Encode a numpy array as base64 text, for the browser to decode into a
+    typed array of the same (little-endian) type.
+    """
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")
 
 
 class SimpleCanvas(mesa.visualization.VisualizationElement):
     local_includes = ["boid_flockers/simple_continuous_canvas.js"]
 
-    def __init__(self, portrayal_method=None, canvas_height=500, canvas_width=500):
+    def __init__(
+        self,
+        portrayal_method=None,
+        canvas_height=500,
+        canvas_width=500,
+        batch_portrayal=None,
+        throttle=True,
+    ):
         """
         Instantiate a new SimpleCanvas
+
+        Args:
+            portrayal_method: Returns the portrayal dict of one agent.
+            canvas_height, canvas_width: Size of the canvas in pixels.
+            batch_portrayal: Used instead of portrayal_method if given. Takes
+                    the model and returns the positions of its agents as an
+                    (N, 2) array, a list of portrayal dicts, and the index in
+                    that list of the portrayal of every agent, as an array.
+            throttle: If True, the browser only draws the latest frame it has
+                    received at each repaint, skipping frames it has no time
+                    to draw instead of falling behind the model.
         """
         self.portrayal_method = portrayal_method
+        self.batch_portrayal = batch_portrayal
         self.canvas_height = canvas_height
         self.canvas_width = canvas_width
-        new_element = "new Simple_Continuous_Module({}, {})".format(
-            self.canvas_width, self.canvas_height
+        new_element = "new Simple_Continuous_Module({}, {}, {})".format(
+            self.canvas_width, self.canvas_height, json.dumps(throttle)
         )
         self.js_code = "elements.push(" + new_element + ");"
 
+    def portray(self, model):
+        """
+        Return the positions, portrayals and portrayal indices of the agents,
+        as batch_portrayal does, using portrayal_method on every agent.
+        """
+        agents = model.schedule.agents
+        positions = np.array([agent.pos for agent in agents], dtype=float)
+        portrayals = []
+        index = {}
+        style_index = np.empty(len(agents), dtype=np.int64)
+        for i, agent in enumerate(agents):
+            portrayal = self.portrayal_method(agent)
+            key = json.dumps(portrayal, sort_keys=True)
+            if key not in index:
+                index[key] = len(portrayals)
+                portrayals.append(portrayal)
+            style_index[i] = index[key]
+        return positions.reshape(-1, 2), portrayals, style_index
+
     def render(self, model):
-        space_state = []
-        for obj in model.schedule.agents:
-            portrayal = self.portrayal_method(obj)
-            x, y = obj.pos
-            x = (x - model.space.x_min) / (model.space.x_max - model.space.x_min)
-            y = (y - model.space.y_min) / (model.space.y_max - model.space.y_min)
-            portrayal["x"] = x
-            portrayal["y"] = y
-            space_state.append(portrayal)
-        return space_state
+        """
+        Return every agent's position, scaled to [0, 1] and packed as float32
+        (x, y) pairs, and the index of its portrayal in a shared list, rather
+        than one portrayal dict per agent.
+        """
+        if self.batch_portrayal is not None:
+            positions, portrayals, style_index = self.batch_portrayal(model)
+        else:
+            positions, portrayals, style_index = self.portray(model)
+        space = model.space
+        scaled = (np.asarray(positions) - (space.x_min, space.y_min)) / (
+            space.x_max - space.x_min,
+            space.y_max - space.y_min,
+        )
+        for style_type in STYLE_TYPES:
+            if len(portrayals) <= np.iinfo(style_type).max + 1:
+                break
+        else:
+            raise ValueError(
+                f"{len(portrayals)} distinct portrayals, more than SimpleCanvas "
+                f"can index with {STYLE_TYPES[-1]}"
+            )
+        styles = np.asarray(style_index).astype(np.dtype(style_type).newbyteorder("<"))
+        return {
+            "portrayals": portrayals,
+            "positions": encode_array(scaled.astype("<f4")),
+            "styles": encode_array(styles),
+            "style_type": style_type,
+        }
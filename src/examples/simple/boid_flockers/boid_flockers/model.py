@@ -7,6 +7,7 @@ Uses numpy arrays to represent vectors.
 
 import mesa
 import numpy as np
+from scipy.spatial import cKDTree
 
 
 class Boid(mesa.Agent):
@@ -52,7 +53,7 @@ class Boid(mesa.Agent):
             match: the relative importance of matching neighbors' headings
         """
         super().__init__(unique_id, model)
-        self.pos = np.array(pos)
+        self.pos = pos
         self.speed = speed
         self.direction = direction
         self.vision = vision
@@ -60,31 +61,53 @@ class Boid(mesa.Agent):
         self.cohere_factor = cohere
         self.separate_factor = separate
         self.match_factor = match
-        self.neighbors = None
+
+    # The position and direction of a Boid are kept in the flock arrays of the
+    # model, in the row of its unique_id.
+
+    @property
+    def pos(self):
+        return self.model.positions[self.unique_id].copy()
+
+    @pos.setter
+    def pos(self, pos):
+        self.model.positions[self.unique_id] = np.nan if pos is None else pos
+
+    @property
+    def direction(self):
+        return self.model.directions[self.unique_id].copy()
+
+    @direction.setter
+    def direction(self, direction):
+        self.model.directions[self.unique_id] = direction
+
+    @property
+    def neighbors(self):
+        """
+        The Boids within vision at the start of the current step, or None
+        before the first step.
+        """
+        flock = self.model.flock
+        if flock is None:
+            return None
+        start, stop = flock["starts"][self.unique_id : self.unique_id + 2]
+        return [self.model.boids[j] for j in flock["neighbors"][start:stop]]
 
     def step(self):
         """
-        Get the Boid's neighbors, compute the new vector, and move accordingly.
-        """
-
-        self.neighbors = self.model.space.get_neighbors(self.pos, self.vision, False)
-        n = 0
-        match_vector, separation_vector, cohere = np.zeros((3, 2))
-        for neighbor in self.neighbors:
-            n += 1
-            heading = self.model.space.get_heading(self.pos, neighbor.pos)
-            cohere += heading
-            if self.model.space.get_distance(self.pos, neighbor.pos) < self.separation:
-                separation_vector -= heading
-            match_vector += neighbor.direction
-        n = max(n, 1)
-        cohere = cohere * self.cohere_factor
-        separation_vector = separation_vector * self.separate_factor
-        match_vector = match_vector * self.match_factor
-        self.direction += (cohere + separation_vector + match_vector) / n
-        self.direction /= np.linalg.norm(self.direction)
-        new_pos = self.pos + self.direction * self.speed
-        self.model.space.move_agent(self, new_pos)
+        Turn by the steering from the Boid's neighbors, and move accordingly.
+        """
+        model = self.model
+        if model.synchronous:
+            steering = model.flock["steering"][self.unique_id]
+        else:
+            steering = model.steering(self)
+        # Update the row of the flock array in place.
+        direction = model.directions[self.unique_id]
+        direction += steering
+        direction /= np.linalg.norm(direction)
+        new_pos = model.positions[self.unique_id] + direction * self.speed
+        model.space.move_agent(self, new_pos)
 
 
 class BoidFlockers(mesa.Model):
@@ -92,6 +115,8 @@ class BoidFlockers(mesa.Model):
     Flocker model class. Handles agent creation, placement and scheduling.
     """
 
+    engines = ("object", "numpy")
+
     def __init__(
         self,
         seed=None,
@@ -104,6 +129,8 @@ class BoidFlockers(mesa.Model):
         cohere=0.03,
         separate=0.015,
         match=0.05,
+        engine="object",
+        synchronous=True,
     ):
         """
         Create a new Flockers model.
@@ -117,8 +144,22 @@ class BoidFlockers(mesa.Model):
                     keep from any other
             cohere, separate, match: factors for the relative importance of
                     the three drives.
+            engine: "object" activates the Boids one at a time, in random
+                    order, each moving itself through the space.
+                    "numpy" turns and moves the whole flock at once with array
+                    operations, wrapping around the torus; the Boids are only
+                    views of the flock arrays. It applies to synchronous
+                    updates only; otherwise the object engine is used.
+            synchronous: If True, every Boid steers from the flock as it was
+                    at the start of the step. If False, each Boid in turn
+                    steers from the flock as it is when it moves, seeing the
+                    Boids that moved before it in the step.
         """
         super().__init__(seed=seed)
+        if engine not in self.engines:
+            raise ValueError(f"engine must be one of {self.engines}, not {engine!r}")
+        self.engine = engine
+        self.synchronous = synchronous
         self.population = population
         self.vision = vision
         self.speed = speed
@@ -126,6 +167,13 @@ class BoidFlockers(mesa.Model):
         self.schedule = mesa.time.RandomActivation(self)
         self.space = mesa.space.ContinuousSpace(width, height, True)
         self.factors = {"cohere": cohere, "separate": separate, "match": match}
+        # Position and direction of every Boid, indexed by unique_id.
+        self.positions = np.full((population, 2), np.nan)
+        self.directions = np.full((population, 2), np.nan)
+        # Boids indexed by unique_id, and the neighbor sums of the current
+        # step, found by find_neighbors().
+        self.boids = []
+        self.flock = None
         self.make_agents()
 
     def make_agents(self):
@@ -149,6 +197,119 @@ class BoidFlockers(mesa.Model):
             )
             self.space.place_agent(boid, pos)
             self.schedule.add(boid)
+            self.boids.append(boid)
+
+    def find_neighbors(self):
+        """
+        Find the neighbors of every Boid at once and sum, for each Boid, the
+        three drives over its neighbors, weighted by its factors and divided
+        by its number of neighbors into the steering added to its direction.
+
+        All the pairs of Boids within vision of each other come from one query
+        of a k-d tree over the toroidal space, built once per step. The sums
+        per Boid are then bincounts over the pairs: the headings to the
+        neighbors (cohere), minus the headings to those closer than the
+        separation (separate), and the neighbors' directions (match).
+        """
+        n = len(self.boids)
+        size = self.space.size
+        positions = self.positions
+        directions = self.directions
+        # Wrapped positions can round up to the size of the space.
+        offsets = positions - (self.space.x_min, self.space.y_min)
+        offsets[offsets >= size] = 0
+        pairs = cKDTree(offsets, boxsize=size).query_pairs(
+            self.vision, output_type="ndarray"
+        )
+        i = np.concatenate((pairs[:, 0], pairs[:, 1]))
+        j = np.concatenate((pairs[:, 1], pairs[:, 0]))
+        headings = positions[j] - positions[i]
+        headings -= size * np.round(headings / size)
+        distances = np.hypot(headings[:, 0], headings[:, 1])
+        # Boids at the exact same position are not neighbors.
+        apart = distances > 0
+        i, j, headings, distances = (
+            i[apart],
+            j[apart],
+            headings[apart],
+            distances[apart],
+        )
+
+        order = np.argsort(i, kind="stable")
+        close = distances < self.separation
+
+        def sums(index, vectors):
+            return np.stack(
+                [np.bincount(index, vectors[:, k], minlength=n) for k in (0, 1)],
+                axis=1,
+            )
+
+        counts = np.bincount(i, minlength=n)
+        cohere = sums(i, headings)
+        separate = -sums(i[close], headings[close])
+        match = sums(i, directions[j])
+        factors = np.array(
+            [
+                (boid.cohere_factor, boid.separate_factor, boid.match_factor)
+                for boid in self.boids
+            ],
+            dtype=float,
+        ).reshape(-1, 3)
+        steering = (
+            cohere * factors[:, 0:1]
+            + separate * factors[:, 1:2]
+            + match * factors[:, 2:3]
+        ) / np.maximum(counts, 1)[:, None]
+        self.flock = {
+            "counts": counts,
+            "cohere": cohere,
+            "separate": separate,
+            "match": match,
+            "steering": steering,
+            "starts": np.searchsorted(i[order], np.arange(n + 1)),
+            "neighbors": j[order],
+        }
+
+    def steering(self, boid):
+        """
+        Return the steering of boid from the flock as it is now, for updates
+        of one Boid at a time: the same sums as find_neighbors(), over the
+        Boids within its vision.
+        """
+        size = self.space.size
+        headings = self.positions - self.positions[boid.unique_id]
+        headings -= size * np.round(headings / size)
+        distances = np.hypot(headings[:, 0], headings[:, 1])
+        near = (distances > 0) & (distances <= boid.vision)
+        close = near & (distances < boid.separation)
+        cohere = headings[near].sum(axis=0) * boid.cohere_factor
+        separate = -headings[close].sum(axis=0) * boid.separate_factor
+        match = self.directions[near].sum(axis=0) * boid.match_factor
+        return (cohere + separate + match) / max(np.count_nonzero(near), 1)
+
+    def move_flock(self):
+        """
+        Turn every Boid by its steering and move it, all at once.
+        """
+        speeds = np.array([boid.speed for boid in self.boids])
+        self.directions += self.flock["steering"]
+        self.directions /= np.linalg.norm(self.directions, axis=1, keepdims=True)
+        origin = (self.space.x_min, self.space.y_min)
+        positions = self.positions + self.directions * speeds[:, None]
+        positions = origin + np.mod(positions - origin, self.space.size)
+        # Through the space, so that its positions for neighbor queries are
+        # updated too.
+        for boid, pos in zip(self.boids, positions):
+            self.space.move_agent(boid, pos)
 
     def step(self):
-        self.schedule.step()
+        self.find_neighbors()
+        if self.engine == "numpy" and self.synchronous:
+            self.move_flock()
+            # The Boids are not stepped, as the flock moved at once; advance
+            # the clock as stepping the schedule would.
+            self.schedule.steps += 1
+            self.schedule.time += 1
+            self._advance_time()
+        else:
+            self.schedule.step()
@@ -1,4 +1,5 @@
 import mesa
+import numpy as np
 
 from .model import BoidFlockers
 from .SimpleContinuousModule import SimpleCanvas
@@ -16,8 +17,32 @@ def boid_draw(agent):
         return {"Shape": "circle", "r": 2, "Filled": "true", "Color": "Green"}
 
 
+BOID_PORTRAYALS = [
+    {"Shape": "circle", "r": 2, "Filled": "true", "Color": "Red"},
+    {"Shape": "circle", "r": 2, "Filled": "true", "Color": "Green"},
+]
+
+
+def boid_batch_draw(model):
+    """
+    Portray the whole flock at once, as boid_draw does for one Boid: red for
+    Boids with at most one neighbor, green for the others.
+    """
+    if model.flock is None:  # Only for the first Frame
+        model.find_neighbors()
+    agents = model.schedule.agents
+    ids = np.fromiter(
+        (agent.unique_id for agent in agents), dtype=int, count=len(agents)
+    )
+    style_index = (model.flock["counts"][ids] >= 2).astype(np.uint8)
+    return model.positions[ids], BOID_PORTRAYALS, style_index
+
+
 boid_canvas = SimpleCanvas(
-    portrayal_method=boid_draw, canvas_height=500, canvas_width=500
+    portrayal_method=boid_draw,
+    canvas_height=500,
+    canvas_width=500,
+    batch_portrayal=boid_batch_draw,
 )
 model_params = {
     "population": mesa.visualization.Slider(
@@ -54,6 +79,10 @@ model_params = {
         step=1,
         description="What is the minimum distance each Boid will attempt to keep from any other",
     ),
+    "engine": mesa.visualization.Choice(
+        "Engine", value="object", choices=list(BoidFlockers.engines)
+    ),
+    "synchronous": mesa.visualization.Checkbox("Synchronous update", True),
 }
 
 server = mesa.visualization.ModularServer(
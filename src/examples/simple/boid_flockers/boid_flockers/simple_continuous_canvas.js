@@ -1,22 +1,50 @@
+// Decode base64 text sent by SimpleCanvas into a typed array.
+const decodeArray = function(text, ArrayType) {
+	const bytes = Uint8Array.from(atob(text), (c) => c.charCodeAt(0));
+	return new ArrayType(bytes.buffer);
+};
+
+// Typed arrays of the portrayal indices, by the style_type of a frame.
+const styleArrayTypes = {
+	uint8: Uint8Array,
+	uint16: Uint16Array,
+	uint32: Uint32Array,
+};
+
 const ContinuousVisualization = function(width, height, context) {
-	this.draw = function(objects) {
-		for (const p of objects) {
-			if (p.Shape == "rect")
-				this.drawRectange(p.x, p.y, p.w, p.h, p.Color, p.Filled);
+	this.draw = function(frame) {
+		const positions = decodeArray(frame.positions, Float32Array);
+		const styles = decodeArray(frame.styles, styleArrayTypes[frame.style_type]);
+		// Draw the agents of one portrayal at a time, so that the circles of
+		// a portrayal are stroked and filled as a single path.
+		frame.portrayals.forEach((p, style) => {
 			if (p.Shape == "circle")
-				this.drawCircle(p.x, p.y, p.r, p.Color, p.Filled);
-		};
+				context.beginPath();
+			for (let i = 0; i < styles.length; i++) {
+				if (styles[i] != style)
+					continue;
+				const x = positions[2 * i];
+				const y = positions[2 * i + 1];
+				if (p.Shape == "rect")
+					this.drawRectange(x, y, p.w, p.h, p.Color, p.Filled);
+				if (p.Shape == "circle")
+					this.addCircle(x, y, p.r);
+			}
+			if (p.Shape == "circle")
+				this.paintPath(p.Color, p.Filled);
+		});
 	};
 
-	this.drawCircle = function(x, y, radius, color, fill) {
+	this.addCircle = function(x, y, radius) {
 		const cx = x * width;
 		const cy = y * height;
 		const r = radius;
 
-		context.beginPath();
+		context.moveTo(cx + r, cy);
 		context.arc(cx, cy, r, 0, Math.PI * 2, false);
-		context.closePath();
+	};
 
+	this.paintPath = function(color, fill) {
 		context.strokeStyle = color;
 		context.stroke();
 
@@ -24,7 +52,6 @@ const ContinuousVisualization = function(width, height, context) {
 			context.fillStyle = color;
 			context.fill();
 		}
-
 	};
 
 	this.drawRectange = function(x, y, w, h, color, fill) {
@@ -50,7 +77,7 @@ const ContinuousVisualization = function(width, height, context) {
 	};
 };
 
-const Simple_Continuous_Module = function(canvas_width, canvas_height) {
+const Simple_Continuous_Module = function(canvas_width, canvas_height, throttle) {
 	// Create the element
 	// ------------------
 
@@ -67,12 +94,30 @@ const Simple_Continuous_Module = function(canvas_width, canvas_height) {
 	const context = canvas.getContext("2d");
 	const canvasDraw = new ContinuousVisualization(canvas_width, canvas_height, context);
 
+	// Latest frame received and not drawn yet, when throttling.
+	let latestFrame = null;
+	const drawLatestFrame = function() {
+		if (latestFrame !== null) {
+			canvasDraw.resetCanvas();
+			canvasDraw.draw(latestFrame);
+			latestFrame = null;
+		}
+	};
+
 	this.render = function(data) {
-		canvasDraw.resetCanvas();
-		canvasDraw.draw(data);
+		if (!throttle) {
+			canvasDraw.resetCanvas();
+			canvasDraw.draw(data);
+			return;
+		}
+		// Draw at the next repaint; a frame replaced before then is skipped.
+		if (latestFrame === null)
+			requestAnimationFrame(drawLatestFrame);
+		latestFrame = data;
 	};
 
 	this.reset = function() {
+		latestFrame = null;
 		canvasDraw.resetCanvas();
 	};
 };
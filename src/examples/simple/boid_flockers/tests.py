@@ -0,0 +1,63 @@
+import base64
+from functools import partial
+
+import numpy as np
+import pytest
+from boid_flockers.model import BoidFlockers
+from boid_flockers.server import boid_batch_draw
+from boid_flockers.SimpleContinuousModule import SimpleCanvas
+from examples_shared.checkpoint import assert_checkpoint_resumes_identically
+
+
+def test_checkpoint_resumes_identically():
+    model, restored = assert_checkpoint_resumes_identically(
+        partial(BoidFlockers, population=50, seed=1), steps=5
+    )
+    np.testing.assert_array_equal(restored.positions, model.positions)
+    np.testing.assert_array_equal(restored.directions, model.directions)
+
+
+def test_empty_flock_steps():
+    for engine in BoidFlockers.engines:
+        model = BoidFlockers(population=0, engine=engine)
+        model.step()
+        assert model.flock["counts"].shape == (0,)
+        assert model.flock["steering"].shape == (0, 2)
+
+
+def test_empty_flock_draws():
+    positions, _, style_index = boid_batch_draw(BoidFlockers(population=0))
+    assert positions.shape == (0, 2)
+    assert style_index.shape == (0,)
+
+
+def test_numpy_step_keeps_space_neighbors():
+    model = BoidFlockers(population=60, width=30, height=20, seed=2, engine="numpy")
+    for _ in range(3):
+        model.step()
+        for boid in model.boids[:10]:
+            found = model.space.get_neighbors(boid.pos, boid.vision, False)
+            headings = model.positions - boid.pos
+            headings -= model.space.size * np.round(headings / model.space.size)
+            distances = np.hypot(headings[:, 0], headings[:, 1])
+            expected = np.flatnonzero(distances <= boid.vision)
+            assert sorted(other.unique_id for other in found) == [
+                i for i in expected if i != boid.unique_id
+            ]
+
+
+@pytest.mark.parametrize(
+    "num_portrayals, style_type", [(256, "uint8"), (257, "uint16"), (70_000, "uint32")]
+)
+def test_style_type_fits_portrayal_count(num_portrayals, style_type):
+    def batch_portrayal(model):
+        portrayals = [{"Shape": "circle", "r": i} for i in range(num_portrayals)]
+        style_index = np.arange(num_portrayals)
+        return np.zeros((num_portrayals, 2)), portrayals, style_index
+
+    frame = SimpleCanvas(batch_portrayal=batch_portrayal).render(
+        BoidFlockers(population=0)
+    )
+    assert frame["style_type"] == style_type
+    styles = np.frombuffer(base64.b64decode(frame["styles"]), dtype=style_type)
+    np.testing.assert_array_equal(styles, np.arange(num_portrayals))
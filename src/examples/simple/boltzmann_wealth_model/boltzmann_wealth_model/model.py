@@ -1,12 +1,42 @@
 import mesa
+import numpy as np
+import pandas as pd
+
+from examples_shared.inequality import WealthHistogram, gini
 
 
 def compute_gini(model):
-    agent_wealths = [agent.wealth for agent in model.schedule.agents]
-    x = sorted(agent_wealths)
-    N = model.num_agents
-    B = sum(xi * (N - i) for i, xi in enumerate(x)) / (N * sum(x))
-    return 1 + (1 / N) - 2 * B
+    if model.wealth_histogram is not None:
+        return model.wealth_histogram.gini()
+    if model.engine == "numpy":
+        return gini(model.wealth)
+    return gini([agent.wealth for agent in model.schedule.agents])
+
+
+class WealthArrayCollector(mesa.DataCollector):
+    """DataCollector that keeps the model's wealth array at every collect()
+    instead of reading a "Wealth" agent variable from agent objects.
+
+    get_agent_vars_dataframe() returns the same (Step, AgentID) indexed
+    "Wealth" frame as the DataCollector of the object engine.
+    """
+
+    def __init__(self, model_reporters=None):
+        super().__init__(model_reporters=model_reporters)
+        self.wealth_records = {}
+
+    def collect(self, model):
+        super().collect(model)
+        self.wealth_records[model.schedule.steps] = model.wealth.copy()
+
+    def get_agent_vars_dataframe(self):
+        records = self.wealth_records
+        num_agents = len(next(iter(records.values()), ()))
+        index = pd.MultiIndex.from_product(
+            [list(records), range(num_agents)], names=["Step", "AgentID"]
+        )
+        wealth = np.concatenate([*records.values(), np.empty(0, dtype=np.int64)])
+        return pd.DataFrame({"Wealth": wealth}, index=index)
 
 
 class BoltzmannWealthModel(mesa.Model):
@@ -17,31 +47,158 @@ class BoltzmannWealthModel(mesa.Model):
     highly skewed distribution of wealth.
     """
 
-    def __init__(self, N=100, width=10, height=10):
+    engines = ("object", "numpy")
+
+    # Moore neighbourhood without the centre cell, as (dx, dy) offsets.
+    moore_offsets = np.array(
+        [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)]
+    )
+
+    def __init__(
+        self,
+        N=100,
+        width=10,
+        height=10,
+        engine="object",
+        batches=64,
+        incremental_gini=False,
+    ):
+        """
+        Create a new Boltzmann wealth model.
+
+        Args:
+            N: Number of agents.
+            width, height: Size of the (toroidal) grid.
+            engine: "object" steps one MoneyAgent at a time on a MultiGrid.
+                    "numpy" keeps positions and wealth in arrays and moves
+                    and transfers money in batched array operations; it has
+                    no grid or agent objects, so it is meant for batch runs.
+            batches: Number of activation batches per step for the numpy
+                     engine. Agents within a batch act simultaneously, so more
+                     batches track the one-at-a-time model more closely.
+            incremental_gini: Keep a WealthHistogram up to date as money
+                              changes hands and compute the Gini coefficient
+                              from it, instead of sorting every agent's
+                              wealth at each step.
+        """
         super().__init__()
+        if engine not in self.engines:
+            raise ValueError(f"engine must be one of {self.engines}, not {engine!r}")
         self.num_agents = N
-        self.grid = mesa.space.MultiGrid(width, height, True)
+        self.width = width
+        self.height = height
+        self.engine = engine
+        self.batches = batches
         self.schedule = mesa.time.RandomActivation(self)
-        self.datacollector = mesa.DataCollector(
-            model_reporters={"Gini": compute_gini}, agent_reporters={"Wealth": "wealth"}
-        )
-        # Create agents
-        for i in range(self.num_agents):
-            a = MoneyAgent(i, self)
-            self.schedule.add(a)
-            # Add the agent to a random grid cell
-            x = self.random.randrange(self.grid.width)
-            y = self.random.randrange(self.grid.height)
-            self.grid.place_agent(a, (x, y))
+        self.wealth_histogram = None
+
+        if self.engine == "numpy":
+            self.datacollector = WealthArrayCollector(
+                model_reporters={"Gini": compute_gini}
+            )
+            self.rng = np.random.default_rng(self.random.getrandbits(64))
+            self.positions = np.column_stack(
+                (
+                    self.rng.integers(width, size=N),
+                    self.rng.integers(height, size=N),
+                )
+            )
+            self.cells = self.positions[:, 0] * height + self.positions[:, 1]
+            self.cell_order = np.argsort(self.cells, kind="stable")
+            self.sorted_cells = self.cells[self.cell_order]
+            self.wealth = np.ones(N, dtype=np.int64)
+            if incremental_gini:
+                self.wealth_histogram = WealthHistogram(self.wealth)
+        else:
+            self.grid = mesa.space.MultiGrid(width, height, True)
+            self.datacollector = mesa.DataCollector(
+                model_reporters={"Gini": compute_gini},
+                agent_reporters={"Wealth": "wealth"},
+            )
+            # Create agents
+            for i in range(self.num_agents):
+                a = MoneyAgent(i, self)
+                self.schedule.add(a)
+                # Add the agent to a random grid cell
+                x = self.random.randrange(self.grid.width)
+                y = self.random.randrange(self.grid.height)
+                self.grid.place_agent(a, (x, y))
+            if incremental_gini:
+                self.wealth_histogram = WealthHistogram(
+                    agent.wealth for agent in self.schedule.agents
+                )
 
         self.running = True
         self.datacollector.collect(self)
 
     def step(self):
+        if self.engine == "numpy":
+            # Agents are activated in random order, as with RandomActivation,
+            # but in batches: everyone in a batch moves, then everyone in it
+            # with money gives a unit to a cellmate. Later batches see the
+            # moves and transfers of earlier ones.
+            activation_order = self.rng.permutation(self.num_agents)
+            for batch in np.array_split(activation_order, self.batches):
+                self.move_agents(batch)
+                self.exchange_money(batch)
+        # With the numpy engine the schedule is empty, but stepping it still
+        # advances the model clock used by the DataCollector.
         self.schedule.step()
         # collect data
         self.datacollector.collect(self)
 
+    def move_agents(self, batch):
+        """Move each agent in batch to a random cell of its Moore neighbourhood."""
+        moves = self.rng.integers(len(self.moore_offsets), size=len(batch))
+        new_positions = self.positions[batch] + self.moore_offsets[moves]
+        new_positions %= (self.width, self.height)
+        self.positions[batch] = new_positions
+        self.cells[batch] = new_positions[:, 0] * self.height + new_positions[:, 1]
+
+        # Take the moved agents out of the cell-sorted order and merge them
+        # back in at their new cells, instead of re-sorting everyone.
+        moved = np.zeros(self.num_agents, dtype=bool)
+        moved[batch] = True
+        stay = ~moved[self.cell_order]
+        rest = self.cell_order[stay]
+        rest_cells = self.sorted_cells[stay]
+        batch = batch[np.argsort(self.cells[batch], kind="stable")]
+        batch_cells = self.cells[batch]
+        insert_at = np.searchsorted(rest_cells, batch_cells)
+        self.cell_order = np.insert(rest, insert_at, batch)
+        self.sorted_cells = np.insert(rest_cells, insert_at, batch_cells)
+
+    def exchange_money(self, batch):
+        """Each agent in batch with money gives one unit to a random cellmate.
+
+        The occupants of a cell are a contiguous run of cell_order. A giver
+        draws one of the first count - 1 slots of its run; if that is its own
+        slot it takes the last one instead, which picks uniformly among the
+        other occupants.
+        """
+        batch = batch[np.argsort(self.cells[batch], kind="stable")]
+        batch_cells = self.cells[batch]
+        starts = np.searchsorted(self.sorted_cells, batch_cells, side="left")
+        counts = np.searchsorted(self.sorted_cells, batch_cells, side="right") - starts
+
+        can_give = (self.wealth[batch] > 0) & (counts > 1)
+        givers = batch[can_give]
+        starts = starts[can_give]
+        counts = counts[can_give]
+        slots = starts + (self.rng.random(len(givers)) * (counts - 1)).astype(np.int64)
+        receivers = self.cell_order[slots]
+        # Ensure agent is not giving money to itself
+        is_self = receivers == givers
+        receivers[is_self] = self.cell_order[starts[is_self] + counts[is_self] - 1]
+
+        if self.wealth_histogram is not None:
+            changed = np.union1d(givers, receivers)
+            old_wealths = self.wealth[changed]
+        self.wealth[givers] -= 1
+        np.add.at(self.wealth, receivers, 1)
+        if self.wealth_histogram is not None:
+            self.wealth_histogram.update(old_wealths, self.wealth[changed])
+
     def run_model(self, n):
         for i in range(n):
             self.step()
@@ -68,6 +225,8 @@ class MoneyAgent(mesa.Agent):
         )  # Ensure agent is not giving money to itself
         if len(cellmates) > 0:
             other = self.random.choice(cellmates)
+            if self.model.wealth_histogram is not None:
+                self.model.wealth_histogram.transfer(self.wealth, other.wealth)
             other.wealth += 1
             self.wealth -= 1
 
@@ -0,0 +1,17 @@
+import numpy as np
+from examples_shared.inequality import gini
+from boltzmann_wealth_model.model import BoltzmannWealthModel
+
+
+def test_numpy_engine():
+    model = BoltzmannWealthModel(N=1000, width=10, height=10, engine="numpy")
+    model.run_model(20)
+    assert model.wealth.sum() == 1000
+    assert (model.wealth >= 0).all()
+    gini_values = model.datacollector.get_model_vars_dataframe()["Gini"]
+    assert len(gini_values) == 21
+    assert gini_values.iloc[-1] == gini(model.wealth)
+
+    wealth = model.datacollector.get_agent_vars_dataframe()["Wealth"]
+    assert (wealth.groupby("Step").sum() == 1000).all()
+    np.testing.assert_array_equal(wealth.loc[20].to_numpy(), model.wealth)
@@ -1,12 +1,11 @@
 import mesa
+from examples_shared.inequality import WealthHistogram, gini
 
 
 def compute_gini(model):
-    agent_wealths = [agent.wealth for agent in model.schedule.agents]
-    x = sorted(agent_wealths)
-    N = model.num_agents
-    B = sum(xi * (N - i) for i, xi in enumerate(x)) / (N * sum(x))
-    return 1 + (1 / N) - 2 * B
+    if model.wealth_histogram is not None:
+        return model.wealth_histogram.gini()
+    return gini([agent.wealth for agent in model.schedule.agents])
 
 
 class BoltzmannWealthModel(mesa.Model):
@@ -17,7 +16,16 @@ class BoltzmannWealthModel(mesa.Model):
     highly skewed distribution of wealth.
     """
 
-    def __init__(self, N=100, width=10, height=10):
+    def __init__(self, N=100, width=10, height=10, incremental_gini=False):
+        """
+        Create a new Boltzmann wealth model.
+
+        Args:
+            incremental_gini: Keep a WealthHistogram up to date as money
+                              changes hands and compute the Gini coefficient
+                              from it, instead of sorting every agent's
+                              wealth at each step.
+        """
         super().__init__()
         self.num_agents = N
         self.grid = mesa.space.MultiGrid(width, height, True)
@@ -33,6 +41,11 @@ class BoltzmannWealthModel(mesa.Model):
             x = self.random.randrange(self.grid.width)
             y = self.random.randrange(self.grid.height)
             self.grid.place_agent(a, (x, y))
+        self.wealth_histogram = None
+        if incremental_gini:
+            self.wealth_histogram = WealthHistogram(
+                agent.wealth for agent in self.schedule.agents
+            )
 
         self.running = True
         self.datacollector.collect(self)
@@ -68,6 +81,8 @@ class MoneyAgent(mesa.Agent):
         )  # Ensure agent is not giving money to itself
         if len(cellmates) > 0:
             other = self.random.choice(cellmates)
+            if self.model.wealth_histogram is not None:
+                self.model.wealth_histogram.transfer(self.wealth, other.wealth)
             other.wealth += 1
             self.wealth -= 1
 
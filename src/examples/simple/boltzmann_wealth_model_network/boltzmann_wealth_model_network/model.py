@@ -1,19 +1,27 @@
 import mesa
 import networkx as nx
+from examples_shared.inequality import WealthHistogram, gini
 
 
 def compute_gini(model):
-    agent_wealths = [agent.wealth for agent in model.schedule.agents]
-    x = sorted(agent_wealths)
-    N = model.num_agents
-    B = sum(xi * (N - i) for i, xi in enumerate(x)) / (N * sum(x))
-    return 1 + (1 / N) - 2 * B
+    if model.wealth_histogram is not None:
+        return model.wealth_histogram.gini()
+    return gini([agent.wealth for agent in model.schedule.agents])
 
 
 class BoltzmannWealthModelNetwork(mesa.Model):
     """A model with some number of agents."""
 
-    def __init__(self, num_agents=7, num_nodes=10):
+    def __init__(self, num_agents=7, num_nodes=10, incremental_gini=False):
+        """
+        Create a new networked Boltzmann wealth model.
+
+        Args:
+            incremental_gini: Keep a WealthHistogram up to date as money
+                              changes hands and compute the Gini coefficient
+                              from it, instead of sorting every agent's
+                              wealth at each step.
+        """
         super().__init__()
         self.num_agents = num_agents
         self.num_nodes = num_nodes if num_nodes >= self.num_agents else self.num_agents
@@ -33,6 +41,11 @@ class BoltzmannWealthModelNetwork(mesa.Model):
             self.schedule.add(a)
             # Add the agent to a random node
             self.grid.place_agent(a, list_of_random_nodes[i])
+        self.wealth_histogram = None
+        if incremental_gini:
+            self.wealth_histogram = WealthHistogram(
+                agent.wealth for agent in self.schedule.agents
+            )
 
         self.running = True
         self.datacollector.collect(self)
@@ -68,6 +81,8 @@ class MoneyAgent(mesa.Agent):
         neighbors = self.model.grid.get_neighbors(self.pos, include_center=False)
         if len(neighbors) > 0:
             other = self.random.choice(neighbors)
+            if self.model.wealth_histogram is not None:
+                self.model.wealth_histogram.transfer(self.wealth, other.wealth)
             other.wealth += 1
             self.wealth -= 1
 
@@ -1,6 +1,7 @@
 """This file was copied over from the original Schelling mesa example."""
 
 import mesa
+from examples_shared.lattice import NeighborTypeCounts
 
 
 class SchellingAgent(mesa.Agent):
@@ -21,16 +22,14 @@ class SchellingAgent(mesa.Agent):
         self.type = agent_type
 
     def step(self):
-        similar = 0
-        for neighbor in self.model.grid.iter_neighbors(
-            self.pos, moore=True, radius=self.model.radius
-        ):
-            if neighbor.type == self.type:
-                similar += 1
+        similar = self.model.type_counts.count(self.type, self.pos)
 
         # If unhappy, move:
         if similar < self.model.homophily:
-            self.model.grid.move_to_empty(self)
+            new_pos = self.model.type_counts.move_to_empty(
+                self.type, self.pos, self.random
+            )
+            self.model.grid.move_agent(self, new_pos)
         else:
             self.model.happy += 1
 
@@ -73,6 +72,11 @@ class Schelling(mesa.Model):
         self.schedule = mesa.time.RandomActivation(self)
         self.grid = mesa.space.SingleGrid(width, height, torus=True)
 
+        # Number of agents of each type around every cell, updated as agents
+        # move, so an agent counts its similar neighbors with one lookup
+        # instead of a scan of the radius; and the pool of empty cells.
+        self.type_counts = NeighborTypeCounts(width, height, radius)
+
         self.happy = 0
         self.datacollector = mesa.DataCollector(
             model_reporters={"happy": "happy"},  # Model-level count of happy agents
@@ -88,6 +92,9 @@ class Schelling(mesa.Model):
                 agent = SchellingAgent(self.next_id(), self, agent_type)
                 self.grid.place_agent(agent, pos)
                 self.schedule.add(agent)
+                self.type_counts.place(agent_type, pos)
+            else:
+                self.type_counts.empty_cells.append(pos)
 
         self.datacollector.collect(self)
 
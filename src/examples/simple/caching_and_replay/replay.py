@@ -0,0 +1,263 @@
+"""
+A replay format for Schelling runs, with no dependency on Mesa-Replay.
+
+Rather than the full model state of every step, a run is stored as a
+keyframe of every agent's cell every keyframe_interval steps, plus the
+moves (agent, from, to) of each step in between. The size of a replay grows
+with the number of moves rather than with the grid size times the steps.
+The arrays are written as uncompressed .npy files in one directory, so a
+replay is memory-mapped when read and any step can be reached from its
+keyframe without reading the rest of the file.
+"""
+
+import json
+from pathlib import Path
+
+import mesa
+import numpy as np
+from model import Schelling, SchellingAgent
+
+
+class ReplayWriter:
+    """
+    Collects the cells of the agents after each step and writes them to the
+    replay directory path on close().
+    """
+
+    def __init__(self, path, width, height, unique_ids, types, keyframe_interval=100):
+        self.path = Path(path)
+        self.width = width
+        self.height = height
+        self.unique_ids = np.asarray(unique_ids)
+        self.types = np.asarray(types, dtype=np.int8)
+        self.keyframe_interval = keyframe_interval
+
+        self.keyframes = []
+        self.happy = []
+        self.delta_offsets = [0]
+        self.delta_agents = []
+        self.delta_from = []
+        self.delta_to = []
+        self.last = None
+
+    def write(self, positions, happy):
+        """
+        Record the state after the next step: positions holds the cell
+        (x * height + y) of every agent, in the order of unique_ids.
+        """
+        positions = np.asarray(positions, dtype=np.int32)
+        if len(self.happy) % self.keyframe_interval == 0:
+            self.keyframes.append(positions)
+        if self.last is None:
+            moved = np.empty(0, dtype=np.int32)
+            self.last = positions
+        else:
+            moved = np.flatnonzero(positions != self.last).astype(np.int32)
+        self.delta_agents.append(moved)
+        self.delta_from.append(self.last[moved])
+        self.delta_to.append(positions[moved])
+        self.delta_offsets.append(self.delta_offsets[-1] + len(moved))
+        self.happy.append(happy)
+        self.last = positions
+
+    def close(self):
+        """Write the replay directory."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "width": self.width,
+            "height": self.height,
+            "keyframe_interval": self.keyframe_interval,
+            "num_steps": len(self.happy),
+        }
+        (self.path / "meta.json").write_text(json.dumps(meta))
+        arrays = {
+            "unique_ids": self.unique_ids,
+            "types": self.types,
+            "keyframes": np.array(self.keyframes, dtype=np.int32),
+            "happy": np.array(self.happy, dtype=np.int64),
+            "delta_offsets": np.array(self.delta_offsets, dtype=np.int64),
+            "delta_agents": np.concatenate(self.delta_agents),
+            "delta_from": np.concatenate(self.delta_from),
+            "delta_to": np.concatenate(self.delta_to),
+        }
+        for name, array in arrays.items():
+            np.save(self.path / f"{name}.npy", array)
+
+
+class ReplayReader:
+    """
+    Memory-mapped view of a replay directory written by ReplayWriter.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        self.width = meta["width"]
+        self.height = meta["height"]
+        self.keyframe_interval = meta["keyframe_interval"]
+        self.num_steps = meta["num_steps"]
+        for name in (
+            "unique_ids",
+            "types",
+            "keyframes",
+            "happy",
+            "delta_offsets",
+            "delta_agents",
+            "delta_from",
+            "delta_to",
+        ):
+            setattr(self, name, np.load(self.path / f"{name}.npy", mmap_mode="r"))
+
+    def moves(self, step):
+        """
+        Return the agents (as indices into unique_ids) that moved during step,
+        with the cells they moved from and to.
+        """
+        start, stop = self.delta_offsets[step], self.delta_offsets[step + 1]
+        return (
+            self.delta_agents[start:stop],
+            self.delta_from[start:stop],
+            self.delta_to[start:stop],
+        )
+
+    def positions(self, step):
+        """
+        Return the cell of every agent after step: the last keyframe before
+        it, with the moves since then applied.
+        """
+        if not 0 <= step < self.num_steps:
+            raise IndexError(f"step {step} is not in the replay")
+        keyframe = step // self.keyframe_interval
+        positions = np.array(self.keyframes[keyframe])
+        start = self.delta_offsets[keyframe * self.keyframe_interval + 1]
+        stop = self.delta_offsets[step + 1]
+        if stop > start:
+            # Only the last move of each agent counts.
+            agents = self.delta_agents[start:stop][::-1]
+            to = self.delta_to[start:stop][::-1]
+            agents, last = np.unique(agents, return_index=True)
+            positions[agents] = to[last]
+        return positions
+
+
+class ReplayableSchelling(Schelling):
+    """
+    Schelling model that records its run to a replay directory, or replays a
+    recorded run instead of simulating.
+
+    In record mode the model runs as Schelling does, and the replay is
+    written once it stops running, or on close(). In replay mode the grid
+    has the size the replay was recorded with, the agents are created from
+    the replay and each step moves them to their recorded cells; seek()
+    jumps to any recorded step.
+    """
+
+    def __init__(
+        self,
+        width=None,
+        height=None,
+        density=0.8,
+        minority_pc=0.2,
+        homophily=3,
+        radius=1,
+        cache_file_path="./my_cache_file_path.replay",
+        replay=False,
+        keyframe_interval=100,
+    ):
+        """
+        width and height default to 20 when recording. When replaying they
+        are read from the replay, and a ValueError is raised if they are
+        given and differ from it.
+        """
+        reader = None
+        if replay:
+            reader = ReplayReader(cache_file_path)
+            for name, value, recorded in (
+                ("width", width, reader.width),
+                ("height", height, reader.height),
+            ):
+                if value is not None and value != recorded:
+                    raise ValueError(
+                        f"{name} is {value}, but the replay was recorded with "
+                        f"{name} {recorded}"
+                    )
+            width, height = reader.width, reader.height
+        else:
+            width = 20 if width is None else width
+            height = 20 if height is None else height
+        super().__init__(
+            width=width,
+            height=height,
+            density=0 if replay else density,
+            minority_pc=minority_pc,
+            homophily=homophily,
+            radius=radius,
+        )
+        self.writer = None
+        self.reader = reader
+        if replay:
+            self.agent_list = []
+            for unique_id, agent_type in zip(self.reader.unique_ids, self.reader.types):
+                self.agent_list.append(
+                    SchellingAgent(int(unique_id), self, int(agent_type))
+                )
+            self.cells = np.full(len(self.agent_list), -1, dtype=np.int32)
+            self.seek(0)
+            # Data collected by Schelling before the agents were placed.
+            self.datacollector = mesa.DataCollector(model_reporters={"happy": "happy"})
+            self.datacollector.collect(self)
+        else:
+            self.agent_list = sorted(self.schedule.agents, key=lambda a: a.unique_id)
+            self.writer = ReplayWriter(
+                cache_file_path,
+                width,
+                height,
+                [agent.unique_id for agent in self.agent_list],
+                [agent.type for agent in self.agent_list],
+                keyframe_interval,
+            )
+            self.writer.write(self.positions(), self.happy)
+
+    def positions(self):
+        """Return the cell (x * height + y) of every agent."""
+        return np.array(
+            [x * self.height + y for x, y in (agent.pos for agent in self.agent_list)],
+            dtype=np.int32,
+        )
+
+    def seek(self, step):
+        """
+        Move the agents of a replaying model to their cells after the given
+        step, and set the model clock and happy count to it.
+        """
+        positions = self.reader.positions(step)
+        moved = np.flatnonzero(positions != self.cells)
+        # Take every moved agent off the grid first, as one may be moving to
+        # the cell another leaves.
+        for i in moved:
+            if self.cells[i] >= 0:
+                self.grid.remove_agent(self.agent_list[i])
+        for i in moved:
+            self.grid.place_agent(
+                self.agent_list[i], tuple(map(int, divmod(positions[i], self.height)))
+            )
+        self.cells = positions
+        self.happy = int(self.reader.happy[step])
+        self.schedule.steps = self.schedule.time = step
+        self._steps = self._time = step
+        self.running = step < self.reader.num_steps - 1
+
+    def step(self):
+        if self.reader is not None:
+            self.seek(self._steps + 1)
+            self.datacollector.collect(self)
+            return
+        super().step()
+        self.writer.write(self.positions(), self.happy)
+        if not self.running:
+            self.close()
+
+    def close(self):
+        """Write the replay of a recording model."""
+        if self.writer is not None:
+            self.writer.close()
@@ -0,0 +1,38 @@
+import pytest
+from replay import ReplayableSchelling
+
+
+def agent_cells(model):
+    return sorted((agent.unique_id, agent.pos, agent.type) for agent in model.agents)
+
+
+def test_seek_matches_recorded_run(tmp_path):
+    path = tmp_path / "run.replay"
+    # Agents never get 9 similar neighbors, so they keep moving.
+    model = ReplayableSchelling(
+        width=10, height=8, homophily=9, cache_file_path=path, keyframe_interval=4
+    )
+    recorded = [agent_cells(model)]
+    for _ in range(10):
+        model.step()
+        recorded.append(agent_cells(model))
+    model.close()
+
+    replay = ReplayableSchelling(cache_file_path=path, replay=True)
+    assert (replay.grid.width, replay.grid.height) == (10, 8)
+    for step in (3, 10, 4, 0, 7, 8):
+        replay.seek(step)
+        assert agent_cells(replay) == recorded[step]
+    replay.seek(5)
+    replay.step()
+    assert agent_cells(replay) == recorded[6]
+
+
+def test_replay_rejects_other_grid_size(tmp_path):
+    path = tmp_path / "run.replay"
+    model = ReplayableSchelling(width=10, height=8, cache_file_path=path)
+    model.step()
+    model.close()
+    ReplayableSchelling(width=10, height=8, cache_file_path=path, replay=True)
+    with pytest.raises(ValueError):
+        ReplayableSchelling(width=20, height=8, cache_file_path=path, replay=True)
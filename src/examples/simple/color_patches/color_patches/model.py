@@ -5,9 +5,11 @@ The model - a 2D lattice where agents live and have an opinion
 from collections import Counter
 
 import mesa
+import numpy as np
+from examples_shared.lattice import ArrayGridView, NeighborCacheMixin
 
 
-class ColorCell(mesa.Agent):
+class ColorCell(NeighborCacheMixin, mesa.Agent):
     """
     Represents a cell's opinion (visualized by a color)
     """
@@ -43,8 +45,7 @@ class ColorCell(mesa.Agent):
         A choice is made at random in case of a tie
         The next state is stored until all cells have been polled
         """
-        _neighbor_iter = self.model.grid.iter_neighbors((self._row, self._col), True)
-        neighbors_opinion = Counter(n.get_state() for n in _neighbor_iter)
+        neighbors_opinion = Counter(n.get_state() for n in self.neighbors)
         # Following is a a tuple (attribute, occurrences)
         polled_opinions = neighbors_opinion.most_common()
         tied_opinions = []
@@ -61,19 +62,64 @@ class ColorCell(mesa.Agent):
         self._state = self._next_state
 
 
+class ColorCellView:
+    """
+    Read-only stand-in for a ColorCell, for the array engine of ColorPatches
+    """
+
+    __slots__ = ("_row", "_col", "_state")
+
+    def __init__(self, pos, state):
+        self._row, self._col = pos
+        self._state = state
+
+    def get_col(self):
+        """Return the col location of this cell."""
+        return self._col
+
+    def get_row(self):
+        """Return the row location of this cell."""
+        return self._row
+
+    def get_state(self):
+        """Return the current state (OPINION) of this cell."""
+        return self._state
+
+
 class ColorPatches(mesa.Model):
     """
     represents a 2D lattice where agents live
     """
 
-    def __init__(self, width=20, height=20):
+    engines = ("object", "numpy")
+
+    def __init__(self, width=20, height=20, seed=None, engine="object"):
         """
         Create a 2D lattice with strict borders where agents live
         The agents next state is first determined before updating the grid
+
+        engine="object" places a ColorCell agent on every position.
+        engine="numpy" keeps the opinions in a uint8 array indexed by
+        (row, col) and polls all the cells at once; the grid is then a read
+        view of the array. Its random generator is drawn from the model's, so
+        runs of either engine are reproducible with seed.
         """
-        super().__init__()
-        self._grid = mesa.space.SingleGrid(width, height, torus=False)
+        super().__init__(seed=seed)
+        if engine not in self.engines:
+            raise ValueError(f"engine must be one of {self.engines}, not {engine!r}")
+        self.engine = engine
         self.schedule = mesa.time.SimultaneousActivation(self)
+        self.running = True
+
+        if self.engine == "numpy":
+            self.rng = np.random.default_rng(self.random.getrandbits(64))
+            self.opinions = self.rng.integers(
+                len(ColorCell.OPINIONS), size=(width, height), dtype=np.uint8
+            )
+            self._grid = ArrayGridView(width, height, self.cell_view)
+            return
+
+        self._grid = mesa.space.SingleGrid(width, height, torus=False)
 
         # self._grid.coord_iter()
         #  --> should really not return content + col + row
@@ -87,14 +133,46 @@ class ColorPatches(mesa.Model):
             self._grid.place_agent(cell, (row, col))
             self.schedule.add(cell)
 
-        self.running = True
-
     def step(self):
         """
         Advance the model one step.
         """
+        if self.engine == "numpy":
+            self.poll_opinions()
         self.schedule.step()
 
+    def cell_view(self, pos):
+        """Return a ColorCellView of the cell at pos, for the numpy engine."""
+        return ColorCellView(pos, int(self.opinions[pos]))
+
+    def poll_opinions(self):
+        """
+        Give every cell the opinion held by most of its neighbors, as
+        ColorCell.step does, for the whole opinion array at once.
+
+        The one-hot planes of the opinions, padded with a border of zeros for
+        the strict edges, are summed over the 8 shifted neighbor windows into
+        a histogram of neighbor opinions per cell. A tie is broken by drawing,
+        for each cell, one of its most common opinions uniformly at random.
+        """
+        width, height = self.opinions.shape
+        opinions = np.arange(len(ColorCell.OPINIONS), dtype=np.uint8)
+        one_hot = np.zeros((len(opinions), width + 2, height + 2), dtype=np.uint8)
+        one_hot[:, 1:-1, 1:-1] = self.opinions == opinions[:, None, None]
+
+        counts = np.zeros((len(opinions), width, height), dtype=np.uint8)
+        for dx in (0, 1, 2):
+            for dy in (0, 1, 2):
+                if (dx, dy) != (1, 1):
+                    counts += one_hot[:, dx : dx + width, dy : dy + height]
+
+        tied = counts == counts.max(axis=0)
+        tied_count = tied.sum(axis=0)
+        # index of the chosen opinion among the tied ones of each cell
+        choice = (self.rng.random((width, height)) * tied_count).astype(np.uint8)
+        chosen = np.cumsum(tied, axis=0, dtype=np.uint8) > choice
+        self.opinions = opinions[chosen.argmax(axis=0)]
+
     # the following is a temporary fix for the framework classes accessing
     # model attributes directly
     # I don't think it should
@@ -61,7 +61,13 @@ server = mesa.visualization.ModularServer(
     ColorPatches,
     [canvas_element],
     "Color Patches",
-    {"width": grid_rows, "height": grid_cols},
+    {
+        "width": grid_rows,
+        "height": grid_cols,
+        "engine": mesa.visualization.Choice(
+            "Engine", value="object", choices=list(ColorPatches.engines)
+        ),
+    },
 )
 
 # webbrowser.open('http://127.0.0.1:8521')  # TODO: make this configurable
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from color_patches.model import ColorPatches
+
+
+def opinion_grid(model):
+    grid = np.zeros((model.grid.width, model.grid.height), dtype=int)
+    for cell, pos in model.grid.coord_iter():
+        grid[pos] = cell.get_state()
+    return grid
+
+
+@pytest.mark.parametrize("engine", ColorPatches.engines)
+def test_same_seed_same_opinions(engine):
+    grids = []
+    for _ in range(2):
+        model = ColorPatches(width=15, height=12, seed=7, engine=engine)
+        for _ in range(5):
+            model.step()
+        grids.append(opinion_grid(model))
+    np.testing.assert_array_equal(grids[0], grids[1])
+    other = ColorPatches(width=15, height=12, seed=8, engine=engine)
+    for _ in range(5):
+        other.step()
+    assert not np.array_equal(grids[0], opinion_grid(other))
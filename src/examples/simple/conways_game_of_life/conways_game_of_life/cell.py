@@ -1,8 +1,11 @@
 import mesa
+from examples_shared.lattice import NeighborCacheMixin
 
 
-class Cell(mesa.Agent):
-    """Represents a single ALIVE or DEAD cell in the simulation."""
+class Cell(NeighborCacheMixin, mesa.Agent):
+    """
+    Represents a single ALIVE or DEAD cell in the simulation.
+    """
 
     DEAD = 0
     ALIVE = 1
@@ -20,10 +23,6 @@ class Cell(mesa.Agent):
     def isAlive(self):
         return self.state == self.ALIVE
 
-    @property
-    def neighbors(self):
-        return self.model.grid.iter_neighbors((self.x, self.y), True)
-
     def step(self):
         """
         Compute if the cell will be dead or alive at the next tick.  This is
@@ -51,3 +50,25 @@ class Cell(mesa.Agent):
         Set the state to the new computed state -- computed in step().
         """
         self.state = self._nextState
+
+
+class CellView:
+    """Read-only stand-in for a Cell, for models that keep the board in an
+    array instead of one Cell agent per square."""
+
+    __slots__ = ("x", "y", "state")
+
+    DEAD = Cell.DEAD
+    ALIVE = Cell.ALIVE
+
+    def __init__(self, pos, state):
+        self.x, self.y = pos
+        self.state = state
+
+    @property
+    def pos(self):
+        return (self.x, self.y)
+
+    @property
+    def isAlive(self):
+        return self.state == self.ALIVE
@@ -1,6 +1,10 @@
+from collections import Counter
+
 import mesa
+import numpy as np
+from examples_shared.lattice import ArrayGridView
 
-from .cell import Cell
+from .cell import Cell, CellView
 
 
 class ConwaysGameOfLife(mesa.Model):
@@ -9,11 +13,34 @@ class ConwaysGameOfLife(mesa.Model):
     Game of Life.
     """
 
-    def __init__(self, width=50, height=50):
+    engines = ("object", "numpy", "sparse")
+
+    # Moore neighbourhood without the centre cell, as (dx, dy) offsets.
+    neighbor_offsets = [
+        (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)
+    ]
+
+    def __init__(self, width=50, height=50, engine="object", initial_live=None):
         """
         Create a new playing area of (width, height) cells.
+
+        Args:
+            width, height: Size of the (toroidal) board.
+            engine: "object" places a Cell agent on every square and steps
+                    them with SimultaneousActivation.
+                    "numpy" keeps the board in a uint8 array and advances it
+                    with rolled neighbour sums; self.grid is then a read view
+                    of the array, so the board can still be displayed.
+                    "sparse" only keeps the set of live cells, so a step
+                    costs time in proportion to the live cells rather than
+                    the board area; self.grid is a read view as above.
+            initial_live: Positions of the cells that start ALIVE. If None,
+                          each cell starts ALIVE with probability 0.1.
         """
         super().__init__()
+        if engine not in self.engines:
+            raise ValueError(f"engine must be one of {self.engines}, not {engine!r}")
+        self.engine = engine
 
         # Set up the grid and schedule.
 
@@ -23,22 +50,136 @@ class ConwaysGameOfLife(mesa.Model):
         # state of all its neighbors -- before they've changed.
         self.schedule = mesa.time.SimultaneousActivation(self)
 
-        # Use a simple grid, where edges wrap around.
-        self.grid = mesa.space.SingleGrid(width, height, torus=True)
+        if initial_live is not None:
+            initial_live = {(x % width, y % height) for x, y in initial_live}
+
+        if self.engine == "sparse" and initial_live is not None:
+            # Only the positions of the live cells are kept.
+            self.live = initial_live
+            self.grid = ArrayGridView(width, height, self.cell_view, torus=True)
+        elif self.engine in ("numpy", "sparse"):
+            # Board indexed by (x, y), with Cell.ALIVE or Cell.DEAD squares.
+            self.cells = np.zeros((width, height), dtype=np.uint8)
+            if initial_live is None:
+                self.rng = np.random.default_rng(self.random.getrandbits(64))
+                self.cells[self.rng.random((width, height)) < 0.1] = Cell.ALIVE
+            elif initial_live:
+                self.cells[tuple(zip(*initial_live))] = Cell.ALIVE
+            if self.engine == "sparse":
+                self.live = set(zip(*(axis.tolist() for axis in self.cells.nonzero())))
+                del self.cells
+            self.grid = ArrayGridView(width, height, self.cell_view, torus=True)
+        else:
+            # Use a simple grid, where edges wrap around.
+            self.grid = mesa.space.SingleGrid(width, height, torus=True)
 
-        # Place a cell at each location, with some initialized to
-        # ALIVE and some to DEAD.
-        for contents, (x, y) in self.grid.coord_iter():
-            cell = Cell((x, y), self)
-            if self.random.random() < 0.1:
-                cell.state = cell.ALIVE
-            self.grid.place_agent(cell, (x, y))
-            self.schedule.add(cell)
+            # Place a cell at each location, with some initialized to
+            # ALIVE and some to DEAD.
+            for contents, (x, y) in self.grid.coord_iter():
+                cell = Cell((x, y), self)
+                if initial_live is None:
+                    if self.random.random() < 0.1:
+                        cell.state = cell.ALIVE
+                elif (x, y) in initial_live:
+                    cell.state = cell.ALIVE
+                self.grid.place_agent(cell, (x, y))
+                self.schedule.add(cell)
 
         self.running = True
 
+    def cell_state(self, pos):
+        """Return the state of the cell at pos."""
+        if self.engine == "numpy":
+            return int(self.cells[pos])
+        if self.engine == "sparse":
+            return Cell.ALIVE if tuple(pos) in self.live else Cell.DEAD
+        return self.grid[pos].state
+
+    def cell_view(self, pos):
+        """Return a CellView of the square at pos, for the array engines."""
+        return CellView(pos, self.cell_state(pos))
+
     def step(self):
         """
         Have the scheduler advance each cell by one step
         """
+        if self.engine == "numpy":
+            self.step_cells()
+        elif self.engine == "sparse":
+            self.step_live()
         self.schedule.step()
+
+    def jump(self, generations):
+        """
+        Advance the board by the given number of generations at once.
+
+        With the sparse engine the pattern is stepped without going through
+        the model step; once it stops changing, the remaining generations are
+        skipped. The model clock is advanced by generations in all cases.
+        """
+        if self.engine != "sparse":
+            for _ in range(generations):
+                self.step()
+            return
+        for _ in range(generations):
+            live = self.live
+            self.step_live()
+            if self.live == live:
+                break
+        self.schedule.steps += generations
+        self.schedule.time += generations
+        self._steps += generations
+        self._time += generations
+
+    def step_cells(self):
+        """
+        Advance the board array by one generation.
+
+        Summing the rolled board over both axes gives, for every square, the
+        number of live cells in its 3x3 block, itself included. A square is
+        alive next tick if that block holds 3 live cells, or 4 and the
+        square itself is alive; this is the usual rule of 3 neighbours to be
+        born and 2 or 3 to survive.
+        """
+        cells = self.cells
+        rows = cells + np.roll(cells, 1, axis=0)
+        rows += np.roll(cells, -1, axis=0)
+        block = rows + np.roll(rows, 1, axis=1)
+        block += np.roll(rows, -1, axis=1)
+        alive = block == 3
+        alive |= (block == 4) & (cells == Cell.ALIVE)
+        self.cells = alive.view(np.uint8)
+
+    def step_live(self):
+        """
+        Advance the set of live cells by one generation.
+
+        Only live cells and their neighbours can be alive at the next tick,
+        so it is enough to count, for every square next to a live cell, how
+        many live neighbours it has.
+        """
+        width, height = self.grid.width, self.grid.height
+        neighbor_counts = Counter(
+            ((x + dx) % width, (y + dy) % height)
+            for x, y in self.live
+            for dx, dy in self.neighbor_offsets
+        )
+        self.live = {
+            pos
+            for pos, count in neighbor_counts.items()
+            if count == 3 or (count == 2 and pos in self.live)
+        }
+
+    def export_grid(self):
+        """
+        Return a SingleGrid holding a Cell agent, in its current state, on
+        every square of the board. The cells belong to a separate model that
+        owns the grid, so they are not registered with this one.
+        """
+        board = mesa.Model()
+        board.grid = mesa.space.SingleGrid(
+            self.grid.width, self.grid.height, torus=True
+        )
+        for contents, pos in self.grid.coord_iter():
+            board.grid.place_agent(Cell(pos, board, contents.state), pos)
+        return board.grid
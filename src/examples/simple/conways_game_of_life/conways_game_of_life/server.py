@@ -6,6 +6,14 @@ from .portrayal import portrayCell
 # Make a world that is 50x50, on a 250x250 display.
 canvas_element = mesa.visualization.CanvasGrid(portrayCell, 50, 50, 250, 250)
 
+model_params = {
+    "height": 50,
+    "width": 50,
+    "engine": mesa.visualization.Choice(
+        "Engine", value="object", choices=list(ConwaysGameOfLife.engines)
+    ),
+}
+
 server = mesa.visualization.ModularServer(
-    ConwaysGameOfLife, [canvas_element], "Game of Life", {"height": 50, "width": 50}
+    ConwaysGameOfLife, [canvas_element], "Game of Life", model_params
 )
@@ -4,6 +4,14 @@ import numpy as np
 from .agents import BarCustomer
 
 
+def get_utility(agent):
+    return agent.utility
+
+
+def get_attendance(agent):
+    return agent.attend
+
+
 class ElFarolBar(mesa.Model):
     def __init__(
         self,
@@ -29,7 +37,7 @@ class ElFarolBar(mesa.Model):
             self.schedule.add(a)
         self.datacollector = mesa.DataCollector(
             model_reporters={"Customers": "attendance"},
-            agent_reporters={"Utility": "utility", "Attendance": "attend"},
+            agent_reporters={"Utility": get_utility, "Attendance": get_attendance},
         )
 
     def step(self):
@@ -1,5 +1,8 @@
+from functools import partial
+
 import numpy as np
 from el_farol.model import ElFarolBar
+from examples_shared.checkpoint import assert_checkpoint_resumes_identically
 
 np.random.seed(1)
 crowd_threshold = 60
@@ -17,3 +20,11 @@ def test_convergence():
     standard_deviation = np.std(attendances)
     deviation = abs(mean - crowd_threshold)
     assert deviation < standard_deviation
+
+
+def test_checkpoint_resumes_identically():
+    model, restored = assert_checkpoint_resumes_identically(
+        partial(ElFarolBar, N=100, crowd_threshold=crowd_threshold, memory_size=10),
+        steps=10,
+    )
+    assert restored.history == model.history
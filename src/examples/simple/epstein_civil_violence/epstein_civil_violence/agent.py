@@ -3,7 +3,22 @@ import math
 import mesa
 
 
-class Citizen(mesa.Agent):
+class EpsteinAgent(mesa.Agent):
+    """
+    Base class of citizens and cops, which look up their neighbors at the
+    start of each of their steps.
+    """
+
+    def __getstate__(self):
+        # neighbors is rebuilt by update_neighbors() before every use. Leaving
+        # it out keeps pickling from following one agent's neighbors to
+        # theirs, across the whole grid, past the recursion limit.
+        state = self.__dict__.copy()
+        state.pop("neighbors", None)
+        return state
+
+
+class Citizen(EpsteinAgent):
     """
     A member of the general population, may or may not be in active rebellion.
     Summary of rule: If grievance - risk > threshold, rebel.
@@ -117,7 +132,7 @@ class Citizen(mesa.Agent):
         )
 
 
-class Cop(mesa.Agent):
+class Cop(EpsteinAgent):
     """
     A cop for life.  No defection.
     Summary of rule: Inspect local vision and arrest a random active agent.
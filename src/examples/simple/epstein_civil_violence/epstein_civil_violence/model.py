@@ -1,8 +1,34 @@
+from functools import partial
+
 import mesa
 
 from .agent import Citizen, Cop
 
 
+def get_x(agent):
+    return agent.pos[0]
+
+
+def get_y(agent):
+    return agent.pos[1]
+
+
+def get_breed(agent):
+    return agent.breed
+
+
+def get_jail_sentence(agent):
+    return getattr(agent, "jail_sentence", None)
+
+
+def get_condition(agent):
+    return getattr(agent, "condition", None)
+
+
+def get_arrest_probability(agent):
+    return getattr(agent, "arrest_probability", None)
+
+
 class EpsteinCivilViolence(mesa.Model):
     """
     Model 1 from "Modeling civil violence: An agent-based computational
@@ -62,18 +88,18 @@ class EpsteinCivilViolence(mesa.Model):
         self.grid = mesa.space.SingleGrid(width, height, torus=True)
 
         model_reporters = {
-            "Quiescent": lambda m: self.count_type_citizens(m, "Quiescent"),
-            "Active": lambda m: self.count_type_citizens(m, "Active"),
+            "Quiescent": partial(self.count_type_citizens, condition="Quiescent"),
+            "Active": partial(self.count_type_citizens, condition="Active"),
             "Jailed": self.count_jailed,
             "Cops": self.count_cops,
         }
         agent_reporters = {
-            "x": lambda a: a.pos[0],
-            "y": lambda a: a.pos[1],
-            "breed": lambda a: a.breed,
-            "jail_sentence": lambda a: getattr(a, "jail_sentence", None),
-            "condition": lambda a: getattr(a, "condition", None),
-            "arrest_probability": lambda a: getattr(a, "arrest_probability", None),
+            "x": get_x,
+            "y": get_y,
+            "breed": get_breed,
+            "jail_sentence": get_jail_sentence,
+            "condition": get_condition,
+            "arrest_probability": get_arrest_probability,
         }
         self.datacollector = mesa.DataCollector(
             model_reporters=model_reporters, agent_reporters=agent_reporters
@@ -0,0 +1,6 @@
+from epstein_civil_violence.model import EpsteinCivilViolence
+from examples_shared.checkpoint import assert_checkpoint_resumes_identically
+
+
+def test_checkpoint_resumes_identically():
+    assert_checkpoint_resumes_identically(EpsteinCivilViolence, steps=5)
@@ -1,5 +1,11 @@
 import mesa
 
+# Tree conditions, as the integer codes used to count them and by the array
+# engine of ForestFire, and as the labels used everywhere else.
+FINE, ON_FIRE, BURNED_OUT = range(3)
+CONDITIONS = ("Fine", "On Fire", "Burned Out")
+CONDITION_CODES = {label: code for code, label in enumerate(CONDITIONS)}
+
 
 class TreeCell(mesa.Agent):
     """
@@ -12,6 +18,8 @@ class TreeCell(mesa.Agent):
 
     unique_id isn't strictly necessary here, but it's good
     practice to give one to each agent anyway.
+
+    Changes of condition are tallied in model.condition_counts.
     """
 
     def __init__(self, pos, model):
@@ -23,7 +31,19 @@ class TreeCell(mesa.Agent):
         """
         super().__init__(pos, model)
         self.pos = pos
-        self.condition = "Fine"
+        self._condition = "Fine"
+        model.condition_counts[FINE] += 1
+
+    @property
+    def condition(self):
+        return self._condition
+
+    @condition.setter
+    def condition(self, condition):
+        counts = self.model.condition_counts
+        counts[CONDITION_CODES[self._condition]] -= 1
+        counts[CONDITION_CODES[condition]] += 1
+        self._condition = condition
 
     def step(self):
         """
@@ -34,3 +54,15 @@ class TreeCell(mesa.Agent):
                 if neighbor.condition == "Fine":
                     neighbor.condition = "On Fire"
             self.condition = "Burned Out"
+
+
+class TreeView:
+    """
+    Read-only stand-in for a TreeCell, for the array engine of ForestFire
+    """
+
+    __slots__ = ("pos", "condition")
+
+    def __init__(self, pos, condition):
+        self.pos = pos
+        self.condition = condition
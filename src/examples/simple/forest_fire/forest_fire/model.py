@@ -1,6 +1,19 @@
 import mesa
+import numpy as np
+from examples_shared.lattice import ArrayGridView
 
-from .agent import TreeCell
+from .agent import (
+    BURNED_OUT,
+    CONDITION_CODES,
+    CONDITIONS,
+    FINE,
+    ON_FIRE,
+    TreeCell,
+    TreeView,
+)
+
+# Grid cell without a tree, in the condition array of the frontier engine.
+EMPTY = -1
 
 
 class ForestFire(mesa.Model):
@@ -8,18 +21,34 @@ class ForestFire(mesa.Model):
     Simple Forest Fire model.
     """
 
-    def __init__(self, width=100, height=100, density=0.65):
+    engines = ("object", "frontier")
+
+    # Moore neighbourhood without the centre cell, as (dx, dy) offsets.
+    neighbor_offsets = np.array(
+        [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)]
+    )
+
+    def __init__(self, width=100, height=100, density=0.65, engine="object"):
         """
         Create a new forest fire model.
 
         Args:
             width, height: The size of the grid to model
             density: What fraction of grid cells have a tree in them.
+            engine: "object" places a TreeCell agent in every cell with a tree
+                    and activates all of them each step.
+                    "frontier" keeps the tree conditions in an array and only
+                    visits the trees on fire and their neighbors; the grid is
+                    then a read view of the array.
         """
         super().__init__()
+        if engine not in self.engines:
+            raise ValueError(f"engine must be one of {self.engines}, not {engine!r}")
+        self.engine = engine
         # Set up model objects
         self.schedule = mesa.time.RandomActivation(self)
-        self.grid = mesa.space.SingleGrid(width, height, torus=False)
+        # Number of trees in each condition, indexed by condition code.
+        self.condition_counts = [0] * len(CONDITIONS)
 
         self.datacollector = mesa.DataCollector(
             {
@@ -29,24 +58,66 @@ class ForestFire(mesa.Model):
             }
         )
 
-        # Place a tree in each cell with Prob = density
-        for contents, (x, y) in self.grid.coord_iter():
-            if self.random.random() < density:
-                # Create a tree
-                new_tree = TreeCell((x, y), self)
-                # Set all trees in the first column on fire.
-                if x == 0:
-                    new_tree.condition = "On Fire"
-                self.grid.place_agent(new_tree, (x, y))
-                self.schedule.add(new_tree)
+        if self.engine == "frontier":
+            self.rng = np.random.default_rng(self.random.getrandbits(64))
+            self.grid = ArrayGridView(width, height, self.tree_view)
+            # Condition code of every cell, indexed by x * height + y.
+            self.conditions = np.empty(width * height, dtype=np.int8)
+            self._uniforms = np.empty(width * height)
+            self.plant_trees(density)
+        else:
+            self.grid = mesa.space.SingleGrid(width, height, torus=False)
+            # Place a tree in each cell with Prob = density
+            for contents, (x, y) in self.grid.coord_iter():
+                if self.random.random() < density:
+                    # Create a tree
+                    new_tree = TreeCell((x, y), self)
+                    # Set all trees in the first column on fire.
+                    if x == 0:
+                        new_tree.condition = "On Fire"
+                    self.grid.place_agent(new_tree, (x, y))
+                    self.schedule.add(new_tree)
 
         self.running = True
         self.datacollector.collect(self)
 
+    def tree_view(self, pos):
+        """
+        Return a TreeView of the tree at pos, or None if there is no tree
+        there, for the frontier engine.
+        """
+        code = self.conditions[pos[0] * self.grid.height + pos[1]]
+        return None if code == EMPTY else TreeView(pos, CONDITIONS[code])
+
+    def plant_trees(self, density, seed=None):
+        """
+        Fill the condition array of the frontier engine with a new forest of
+        the given density, with the first column on fire.
+
+        The existing arrays are reused, so one model can burn many forests of
+        the same size. If seed is given, the random generator is reseeded
+        with it first.
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        height = self.grid.height
+        self.rng.random(out=self._uniforms)
+        self.conditions.fill(EMPTY)
+        self.conditions[self._uniforms < density] = FINE
+        # Set all trees in the first column on fire.
+        first_column = self.conditions[:height]
+        self.burning = np.flatnonzero(first_column == FINE)
+        first_column[self.burning] = ON_FIRE
+        self.condition_counts[FINE] = int(np.count_nonzero(self.conditions == FINE))
+        self.condition_counts[ON_FIRE] = len(self.burning)
+        self.condition_counts[BURNED_OUT] = 0
+
     def step(self):
         """
         Advance the model by one step.
         """
+        if self.engine == "frontier":
+            self.spread_fire()
         self.schedule.step()
         # collect data
         self.datacollector.collect(self)
@@ -55,13 +126,77 @@ class ForestFire(mesa.Model):
         if self.count_type(self, "On Fire") == 0:
             self.running = False
 
+    def spread_fire(self):
+        """
+        Advance the fire front by one step, as the object engine does.
+
+        Activating the trees in random order is the same as giving each one
+        an independent uniform random rank and activating them by rank. Only
+        the ranks of trees on or next to the fire matter: a tree burns out
+        during the step if it was on fire at the start of it, or if a
+        neighbor that burns out this step has a lower rank, having set it on
+        fire before its own turn. The trees that burn out are found in rounds,
+        each adding those lit by the previous round. Fine trees next to them
+        that did not burn are on fire at the end of the step.
+        """
+        height = self.grid.height
+        size = self.conditions.size
+        dxs, dys = self.neighbor_offsets.T
+        offsets = dxs * height + dys
+
+        burning = self.burning
+        ranks = self.rng.random(len(burning))
+        self.conditions[burning] = BURNED_OUT
+        burned = len(burning)
+        # Fine trees lit this step that have not burned out yet, sorted,
+        # with their ranks.
+        lit = np.empty(0, dtype=np.int64)
+        lit_ranks = np.empty(0)
+
+        while len(burning):
+            neighbors = burning[:, None] + offsets
+            y = burning % height
+            inside = (neighbors >= 0) & (neighbors < size)
+            inside &= (y[:, None] + dys >= 0) & (y[:, None] + dys < height)
+            lighter_ranks = np.broadcast_to(ranks[:, None], neighbors.shape)[inside]
+            neighbors = neighbors[inside]
+            fine = self.conditions[neighbors] == FINE
+            neighbors, lighter_ranks = neighbors[fine], lighter_ranks[fine]
+
+            candidates, pair_index = np.unique(neighbors, return_inverse=True)
+            at = np.searchsorted(lit, candidates)
+            known = at < len(lit)
+            known[known] = lit[at[known]] == candidates[known]
+            candidate_ranks = np.empty(len(candidates))
+            candidate_ranks[known] = lit_ranks[at[known]]
+            candidate_ranks[~known] = self.rng.random(np.count_nonzero(~known))
+
+            burns = np.zeros(len(candidates), dtype=bool)
+            burns[pair_index[candidate_ranks[pair_index] > lighter_ranks]] = True
+
+            # Keep the lit trees that still have not burned, and add the new.
+            keep = np.ones(len(lit), dtype=bool)
+            keep[at[known & burns]] = False
+            new = ~known & ~burns
+            lit = np.concatenate((lit[keep], candidates[new]))
+            lit_ranks = np.concatenate((lit_ranks[keep], candidate_ranks[new]))
+            order = np.argsort(lit, kind="stable")
+            lit, lit_ranks = lit[order], lit_ranks[order]
+
+            burning, ranks = candidates[burns], candidate_ranks[burns]
+            self.conditions[burning] = BURNED_OUT
+            burned += len(burning)
+
+        self.conditions[lit] = ON_FIRE
+        self.burning = lit
+        counts = self.condition_counts
+        counts[FINE] -= burned - counts[ON_FIRE] + len(lit)
+        counts[ON_FIRE] = len(lit)
+        counts[BURNED_OUT] += burned
+
     @staticmethod
     def count_type(model, tree_condition):
         """
         Helper method to count trees in a given condition in a given model.
         """
-        count = 0
-        for tree in model.schedule.agents:
-            if tree.condition == tree_condition:
-                count += 1
-        return count
+        return model.condition_counts[CONDITION_CODES[tree_condition]]
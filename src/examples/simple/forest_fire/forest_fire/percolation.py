@@ -0,0 +1,141 @@
+"""
+Percolation sweeps: burn many independent forests per tree density, with the
+frontier engine, to find the density above which fire crosses the forest.
+
+Run ``python -m forest_fire.percolation`` from the example directory to sweep
+the default densities and plot the results.
+"""
+
+import itertools
+from multiprocessing import Pool
+from statistics import NormalDist
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from tqdm.auto import tqdm
+
+from .agent import BURNED_OUT
+from .model import ForestFire
+
+# One model per forest size in each worker process. Its arrays are reused by
+# every forest of that size the worker burns.
+_forests = {}
+
+
+def burn_forest(width, height, density, seed):
+    """
+    Burn one forest until the fire is out and return its final statistics:
+    the fraction of the trees that burned, the number of steps the fire
+    lasted, and whether it reached the last column.
+    """
+    forest = _forests.get((width, height))
+    if forest is None:
+        forest = ForestFire(width, height, 0, engine="frontier")
+        _forests[width, height] = forest
+    forest.plant_trees(density, seed)
+
+    burn_time = 0
+    while len(forest.burning):
+        forest.spread_fire()
+        burn_time += 1
+
+    trees = sum(forest.condition_counts)
+    burned = forest.condition_counts[BURNED_OUT]
+    return {
+        "density": density,
+        "seed": seed,
+        "burned_fraction": burned / trees if trees else 0.0,
+        "burn_time": burn_time,
+        "crossed": bool((forest.conditions[-height:] == BURNED_OUT).any()),
+    }
+
+
+def _burn_forest_star(args):
+    return burn_forest(*args)
+
+
+def percolation_sweep(
+    densities,
+    seeds=100,
+    width=100,
+    height=100,
+    number_processes=None,
+    display_progress=True,
+):
+    """
+    Burn seeds forests for every density, spread over a pool of
+    number_processes workers (all CPUs if None).
+
+    Forest i of every density is planted from seed i, so the curves over
+    density are compared on the same random numbers. Only the statistics of
+    burn_forest() are sent back from the workers.
+
+    returns a DataFrame with one row per forest
+    """
+    runs = [
+        (width, height, density, seed)
+        for density, seed in itertools.product(densities, range(seeds))
+    ]
+    with tqdm(total=len(runs), disable=not display_progress) as pbar:
+        if number_processes == 1:
+            results = []
+            for run in runs:
+                results.append(_burn_forest_star(run))
+                pbar.update()
+        else:
+            with Pool(number_processes) as pool:
+                results = []
+                for result in pool.imap_unordered(
+                    _burn_forest_star, runs, chunksize=max(1, seeds // 4)
+                ):
+                    results.append(result)
+                    pbar.update()
+    return pd.DataFrame(results).sort_values(["density", "seed"], ignore_index=True)
+
+
+def summarize(results, confidence=0.95):
+    """
+    Return, for every density, the mean of each statistic with the bounds of
+    its confidence interval (normal approximation), as columns
+    <statistic>, <statistic>_low and <statistic>_high. Intervals of the
+    fractions are clipped to [0, 1].
+    """
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    grouped = results.groupby("density")
+    summary = pd.DataFrame({"forests": grouped.size()})
+    for statistic in ("burned_fraction", "burn_time", "crossed"):
+        mean = grouped[statistic].mean()
+        half_width = z * grouped[statistic].sem().fillna(0)
+        summary[statistic] = mean
+        low, high = mean - half_width, mean + half_width
+        if statistic != "burn_time":
+            low, high = low.clip(0, 1), high.clip(0, 1)
+        summary[f"{statistic}_low"] = low
+        summary[f"{statistic}_high"] = high
+    return summary.reset_index()
+
+
+def plot_summary(summary, statistic="burned_fraction", ax=None):
+    """
+    Plot the mean of statistic against density, with its confidence band.
+    """
+    if ax is None:
+        ax = plt.gca()
+    ax.plot(summary["density"], summary[statistic])
+    ax.fill_between(
+        summary["density"],
+        summary[f"{statistic}_low"],
+        summary[f"{statistic}_high"],
+        alpha=0.3,
+    )
+    ax.set_xlabel("density")
+    ax.set_ylabel(statistic)
+    return ax
+
+
+if __name__ == "__main__":
+    summary = summarize(percolation_sweep(np.round(np.arange(0.3, 0.61, 0.01), 2)))
+    print(summary.to_string(index=False))
+    plot_summary(summary)
+    plt.show()
@@ -30,6 +30,9 @@ model_params = {
     "height": 100,
     "width": 100,
     "density": mesa.visualization.Slider("Tree density", 0.65, 0.01, 1.0, 0.01),
+    "engine": mesa.visualization.Choice(
+        "Engine", value="object", choices=list(ForestFire.engines)
+    ),
 }
 server = mesa.visualization.ModularServer(
     ForestFire, [canvas_element, tree_chart, pie_chart], "Forest Fire", model_params
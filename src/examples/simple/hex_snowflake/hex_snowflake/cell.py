@@ -16,6 +16,7 @@ class Cell(mesa.Agent):
         self.state = init_state
         self._nextState = None
         self.isConsidered = False
+        self.live_neighbors = 0
 
     @property
     def isAlive(self):
@@ -23,7 +24,9 @@ class Cell(mesa.Agent):
 
     @property
     def neighbors(self):
-        return self.model.grid.iter_neighbors((self.x, self.y))
+        return self.model.grid.iter_cell_list_contents(
+            self.model.neighbor_positions((self.x, self.y))
+        )
 
     @property
     def considered(self):
@@ -46,12 +49,12 @@ class Cell(mesa.Agent):
         if not self.isAlive and self.isConsidered:
             # Get the neighbors and apply the rules on whether to be alive or dead
             # at the next tick.
-            live_neighbors = sum(neighbor.isAlive for neighbor in self.neighbors)
+            self.live_neighbors = sum(neighbor.isAlive for neighbor in self.neighbors)
 
-            if live_neighbors == 1:
+            if self.live_neighbors == 1:
                 self._nextState = self.ALIVE
-                for a in self.neighbors:
-                    a.isConsidered = True
+                for pos in self.model.neighbor_positions((self.x, self.y)):
+                    self.model.consider(pos)
 
     def advance(self):
         """
@@ -9,6 +9,13 @@ class HexSnowflake(mesa.Model):
     of cells with adjacency rules specific to hexagons.
     """
 
+    # Hex neighbourhood as (dx, dy) offsets, by column parity (x % 2).
+    # See HexSingleGrid.get_neighborhood.
+    neighbor_offsets = (
+        ((0, -1), (0, 1), (-1, 1), (-1, 0), (1, 1), (1, 0)),
+        ((0, -1), (0, 1), (-1, 0), (-1, -1), (1, 0), (1, -1)),
+    )
+
     def __init__(self, width=50, height=50):
         """
         Create a new playing area of (width, height) cells.
@@ -16,32 +23,77 @@ class HexSnowflake(mesa.Model):
         super().__init__()
         # Set up the grid and schedule.
 
-        # Use SimultaneousActivation which simulates all the cells
-        # computing their next state simultaneously.  This needs to
-        # be done because each cell's next state depends on the current
-        # state of all its neighbors -- before they've changed.
+        # Cells are updated simultaneously: every considered cell computes its
+        # next state before any of them changes, see self.step(). Only those
+        # cells are stepped, so the schedule holds no agents and just keeps
+        # the model clock.
         self.schedule = mesa.time.SimultaneousActivation(self)
 
         # Use a hexagonal grid, where edges wrap around.
         self.grid = mesa.space.HexSingleGrid(width, height, torus=True)
 
-        # Place a dead cell at each location.
-        for contents, pos in self.grid.coord_iter():
-            cell = Cell(pos, self)
-            self.grid.place_agent(cell, pos)
-            self.schedule.add(cell)
+        # Dead cells that can come alive, in the order they were considered.
+        # A Cell is only created once it is considered, so the rest of the
+        # grid stays empty; those squares are dead.
+        self.frontier = {}
 
         # activate the center(ish) cell.
-        centerishCell = self.grid[width // 2][height // 2]
+        centerishCell = self.get_cell((width // 2, height // 2))
 
         centerishCell.state = 1
-        for a in centerishCell.neighbors:
-            a.isConsidered = True
+        for pos in self.neighbor_positions(centerishCell.pos):
+            self.consider(pos)
 
         self.running = True
 
+    def neighbor_positions(self, pos):
+        """
+        Return the positions of the cells next to pos, wrapping around the
+        edges.
+        """
+        x, y = pos
+        width, height = self.grid.width, self.grid.height
+        # dict.fromkeys drops the repeats that wrapping gives on tiny grids.
+        return list(
+            dict.fromkeys(
+                ((x + dx) % width, (y + dy) % height)
+                for dx, dy in self.neighbor_offsets[x % 2]
+            )
+        )
+
+    def get_cell(self, pos):
+        """
+        Return the cell at pos, placing a dead cell there first if needed.
+        """
+        cell = self.grid[pos]
+        if cell is None:
+            cell = Cell(pos, self)
+            self.grid.place_agent(cell, pos)
+        return cell
+
+    def consider(self, pos):
+        """
+        Mark the cell at pos as considered, adding it to the frontier if it is
+        dead.
+        """
+        cell = self.get_cell(pos)
+        if not cell.isConsidered:
+            cell.isConsidered = True
+            if not cell.isAlive:
+                self.frontier[cell] = None
+
     def step(self):
         """
-        Have the scheduler advance each cell by one step
+        Advance the cells of the frontier by one step
         """
+        cells = list(self.frontier)
+        for cell in cells:
+            cell.step()
+        for cell in cells:
+            cell.advance()
+            # Live cells stay alive, and a dead cell with more than one live
+            # neighbour will always have more, so neither can change again.
+            if cell.isAlive or cell.live_neighbors > 1:
+                del self.frontier[cell]
+        # Advance the model clock.
         self.schedule.step()
@@ -1,8 +1,11 @@
 import mesa
+from examples_shared.lattice import NeighborCacheMixin
 
 
-class PDAgent(mesa.Agent):
-    """Agent member of the iterated, spatial prisoner's dilemma model."""
+class PDAgent(NeighborCacheMixin, mesa.Agent):
+    """
+    Agent member of the iterated, spatial prisoner's dilemma model.
+    """
 
     def __init__(self, pos, model, starting_move=None):
         """
@@ -31,8 +34,7 @@ class PDAgent(mesa.Agent):
         """Get the best neighbor's move, and change own move accordingly
         if better than own score."""
 
-        neighbors = self.model.grid.get_neighbors(self.pos, True, include_center=True)
-        best_neighbor = max(neighbors, key=lambda a: a.score)
+        best_neighbor = max(self.neighborhood, key=lambda a: a.score)
         self.next_move = best_neighbor.move
 
         if self.model.schedule_type != "Simultaneous":
@@ -43,9 +45,25 @@ class PDAgent(mesa.Agent):
         self.score += self.increment_score()
 
     def increment_score(self):
-        neighbors = self.model.grid.get_neighbors(self.pos, True)
         if self.model.schedule_type == "Simultaneous":
-            moves = [neighbor.next_move for neighbor in neighbors]
+            moves = [neighbor.next_move for neighbor in self.neighbors]
         else:
-            moves = [neighbor.move for neighbor in neighbors]
+            moves = [neighbor.move for neighbor in self.neighbors]
         return sum(self.model.payoff[(self.move, move)] for move in moves)
+
+
+class PDAgentView:
+    """
+    Read-only stand-in for a PDAgent, for the array engine of PdGrid
+    """
+
+    __slots__ = ("pos", "move", "score")
+
+    def __init__(self, pos, move, score):
+        self.pos = pos
+        self.move = move
+        self.score = score
+
+    @property
+    def isCooroperating(self):
+        return self.move == "C"
@@ -1,6 +1,19 @@
+import itertools
+
 import mesa
+import numpy as np
+from examples_shared.lattice import ArrayGridView
+
+from .agent import PDAgent, PDAgentView
+
+# Moves as stored by the array engine of PdGrid.
+MOVES = ("C", "D")
+
 
-from .agent import PDAgent
+def count_cooperating(model):
+    if model.engine == "numpy":
+        return int(np.count_nonzero(model.moves == MOVES.index("C")))
+    return sum(agent.move == "C" for agent in model.schedule.agents)
 
 
 class PdGrid(mesa.Model):
@@ -17,8 +30,21 @@ class PdGrid(mesa.Model):
 
     payoff = {("C", "C"): 1, ("C", "D"): 0, ("D", "C"): 1.6, ("D", "D"): 0}
 
+    engines = ("object", "numpy")
+
+    # Moore neighbourhood as (dx, dy) offsets, in the order used by
+    # grid.get_neighbors, with and without the centre cell.
+    neighborhood_offsets = list(itertools.product((-1, 0, 1), repeat=2))
+    neighbor_offsets = [offset for offset in neighborhood_offsets if offset != (0, 0)]
+
     def __init__(
-        self, width=50, height=50, schedule_type="Random", payoffs=None, seed=None
+        self,
+        width=50,
+        height=50,
+        schedule_type="Random",
+        payoffs=None,
+        seed=None,
+        engine="object",
     ):
         """
         Create a new Spatial Prisoners' Dilemma Model.
@@ -28,35 +54,95 @@ class PdGrid(mesa.Model):
             schedule_type: Can be "Sequential", "Random", or "Simultaneous".
                            Determines the agent activation regime.
             payoffs: (optional) Dictionary of (move, neighbor_move) payoffs.
+            engine: "object" creates one PDAgent per grid cell.
+                    "numpy" keeps the moves and scores in arrays and updates
+                    them all at once; the grid is then a read view of the
+                    arrays. It only applies to the "Simultaneous" schedule;
+                    the other schedules always use the object engine.
         """
         super().__init__()
-        self.grid = mesa.space.SingleGrid(width, height, torus=True)
+        if engine not in self.engines:
+            raise ValueError(f"engine must be one of {self.engines}, not {engine!r}")
+        if payoffs is not None:
+            self.payoff = payoffs
         self.schedule_type = schedule_type
         self.schedule = self.schedule_types[self.schedule_type](self)
+        self.engine = engine if schedule_type == "Simultaneous" else "object"
 
-        # Create agents
-        for x in range(width):
-            for y in range(height):
-                agent = PDAgent((x, y), self)
-                self.grid.place_agent(agent, (x, y))
-                self.schedule.add(agent)
+        if self.engine == "numpy":
+            self.grid = ArrayGridView(width, height, self.agent_view, torus=True)
+            # payoff_matrix[my_move, other_move], moves indexing MOVES
+            self.payoff_matrix = np.array(
+                [[self.payoff[(a, b)] for b in MOVES] for a in MOVES], dtype=float
+            )
+            # Moves are drawn as PDAgent draws them, so both engines start
+            # from the same moves for a given seed.
+            self.moves = np.array(
+                [
+                    [MOVES.index(self.random.choice(["C", "D"])) for y in range(height)]
+                    for x in range(width)
+                ],
+                dtype=np.int8,
+            )
+            self.scores = np.zeros((width, height))
+        else:
+            self.grid = mesa.space.SingleGrid(width, height, torus=True)
+            # Create agents
+            for x in range(width):
+                for y in range(height):
+                    agent = PDAgent((x, y), self)
+                    self.grid.place_agent(agent, (x, y))
+                    self.schedule.add(agent)
 
         self.datacollector = mesa.DataCollector(
-            {
-                "Cooperating_Agents": lambda m: len(
-                    [a for a in m.schedule.agents if a.move == "C"]
-                )
-            }
+            {"Cooperating_Agents": count_cooperating}
         )
 
         self.running = True
         self.datacollector.collect(self)
 
     def step(self):
+        if self.engine == "numpy":
+            self.play()
         self.schedule.step()
         # collect data
         self.datacollector.collect(self)
 
+    def agent_view(self, pos):
+        """Return a PDAgentView of the agent at pos, for the numpy engine."""
+        return PDAgentView(pos, MOVES[self.moves[pos]], float(self.scores[pos]))
+
+    def shifted(self, array, dx, dy):
+        """Return array[(x + dx) % width, (y + dy) % height] for every (x, y)."""
+        return np.roll(array, (-dx, -dy), axis=(0, 1))
+
+    def play(self):
+        """
+        Simultaneous step of every agent, as PDAgent.step and PDAgent.advance
+        do, on the move and score arrays.
+
+        Each cell takes the move of the highest scoring cell of its Moore
+        neighborhood, itself included, picking the first one in
+        get_neighbors order on ties as max() does. The payoffs against the
+        new moves of its neighbors are then added to its score, in the same
+        order as PDAgent.increment_score so the sums are identical.
+        """
+        best_scores = self.shifted(self.scores, *self.neighborhood_offsets[0])
+        best_moves = self.shifted(self.moves, *self.neighborhood_offsets[0])
+        for dx, dy in self.neighborhood_offsets[1:]:
+            scores = self.shifted(self.scores, dx, dy)
+            better = scores > best_scores
+            best_scores[better] = scores[better]
+            best_moves[better] = self.shifted(self.moves, dx, dy)[better]
+        self.moves = best_moves
+
+        increments = np.zeros_like(self.scores)
+        for dx, dy in self.neighbor_offsets:
+            increments += self.payoff_matrix[
+                self.moves, self.shifted(self.moves, dx, dy)
+            ]
+        self.scores += increments
+
     def run(self, n):
         """Run the model for n steps."""
         for _ in range(n):
@@ -14,6 +14,11 @@ model_params = {
         value="Random",
         choices=list(PdGrid.schedule_types.keys()),
     ),
+    "engine": mesa.visualization.Choice(
+        "Engine (numpy only applies to Simultaneous)",
+        value="object",
+        choices=list(PdGrid.engines),
+    ),
 }
 
 server = mesa.visualization.ModularServer(
@@ -1,4 +1,9 @@
 import mesa
+import numpy as np
+from examples_shared.lattice import ArrayGridView, NeighborTypeCounts
+
+# Cell without an agent, in the cell array of the numpy engine.
+EMPTY = -1
 
 
 class SchellingAgent(mesa.Agent):
@@ -19,25 +24,35 @@ class SchellingAgent(mesa.Agent):
         self.type = agent_type
 
     def step(self):
-        similar = 0
-        for neighbor in self.model.grid.iter_neighbors(
-            self.pos, moore=True, radius=self.model.radius
-        ):
-            if neighbor.type == self.type:
-                similar += 1
+        similar = self.model.type_counts.count(self.type, self.pos)
 
         # If unhappy, move:
         if similar < self.model.homophily:
-            self.model.grid.move_to_empty(self)
+            new_pos = self.model.type_counts.move_to_empty(
+                self.type, self.pos, self.random
+            )
+            self.model.grid.move_agent(self, new_pos)
         else:
             self.model.happy += 1
 
 
+class SchellingAgentView:
+    """Read-only stand-in for a SchellingAgent, for the numpy engine."""
+
+    __slots__ = ("pos", "type")
+
+    def __init__(self, pos, agent_type):
+        self.pos = pos
+        self.type = agent_type
+
+
 class Schelling(mesa.Model):
     """
     Model class for the Schelling segregation model.
     """
 
+    engines = ("object", "numpy")
+
     def __init__(
         self,
         height=20,
@@ -47,6 +62,7 @@ class Schelling(mesa.Model):
         density=0.8,
         minority_pc=0.2,
         seed=None,
+        engine="object",
     ):
         """
         Create a new Schelling model.
@@ -58,9 +74,20 @@ class Schelling(mesa.Model):
             homophily: Minimum number of agents of same class needed to be happy
             radius: Search radius for checking similarity
             seed: Seed for Reproducibility
+            engine: "object" activates one SchellingAgent at a time, in
+                    random order; an unhappy agent moves before the next one
+                    looks at its neighbors.
+                    "numpy" keeps the agent types in an array and updates
+                    all agents at once: every unhappy agent moves in the same
+                    step, to a random cell among the empty cells and the
+                    cells the unhappy agents leave. self.grid is then a read
+                    view of the array. Suited to grids of millions of cells.
         """
 
         super().__init__(seed=seed)
+        if engine not in self.engines:
+            raise ValueError(f"engine must be one of {self.engines}, not {engine!r}")
+        self.engine = engine
         self.height = height
         self.width = width
         self.density = density
@@ -69,13 +96,31 @@ class Schelling(mesa.Model):
         self.radius = radius
 
         self.schedule = mesa.time.RandomActivation(self)
-        self.grid = mesa.space.SingleGrid(width, height, torus=True)
 
         self.happy = 0
         self.datacollector = mesa.DataCollector(
             model_reporters={"happy": "happy"},  # Model-level count of happy agents
         )
 
+        if self.engine == "numpy":
+            self.rng = np.random.default_rng(self.random.getrandbits(64))
+            self.grid = ArrayGridView(width, height, self.agent_view, torus=True)
+            # Type of the agent in every cell, or EMPTY, indexed by (x, y).
+            self.cells = np.full((width, height), EMPTY, dtype=np.int8)
+            occupied = self.rng.random((width, height)) < self.density
+            minority = self.rng.random((width, height)) < self.minority_pc
+            self.cells[occupied] = minority[occupied]
+            self.num_agents = int(np.count_nonzero(occupied))
+            self.datacollector.collect(self)
+            return
+
+        self.grid = mesa.space.SingleGrid(width, height, torus=True)
+
+        # Number of agents of each type around every cell, updated as agents
+        # move, so an agent counts its similar neighbors with one lookup
+        # instead of a scan of the radius; and the pool of empty cells.
+        self.type_counts = NeighborTypeCounts(width, height, radius)
+
         # Set up agents
         # We use a grid iterator that returns
         # the coordinates of a cell as well as
@@ -86,6 +131,9 @@ class Schelling(mesa.Model):
                 agent = SchellingAgent(self.next_id(), self, agent_type)
                 self.grid.place_agent(agent, pos)
                 self.schedule.add(agent)
+                self.type_counts.place(agent_type, pos)
+            else:
+                self.type_counts.empty_cells.append(pos)
 
         self.datacollector.collect(self)
 
@@ -94,9 +142,63 @@ class Schelling(mesa.Model):
         Run one step of the model.
         """
         self.happy = 0  # Reset counter of happy agents
+        if self.engine == "numpy":
+            self.move_unhappy()
         self.schedule.step()
 
         self.datacollector.collect(self)
 
-        if self.happy == self.schedule.get_agent_count():
+        if self.engine == "numpy":
+            num_agents = self.num_agents
+        else:
+            num_agents = self.schedule.get_agent_count()
+        if self.happy == num_agents:
             self.running = False
+
+    def agent_view(self, pos):
+        """
+        Return a SchellingAgentView of the agent at pos, or None if the cell
+        is empty, for the numpy engine.
+        """
+        agent_type = int(self.cells[pos])
+        return None if agent_type == EMPTY else SchellingAgentView(pos, agent_type)
+
+    def similar_counts(self):
+        """
+        Return, for every cell, the number of agents within radius of it that
+        have the same type as its own agent (0 for empty cells).
+
+        The counts are a convolution of the mask of each type with a square
+        kernel of side 2 * radius + 1, done as sums of the mask rolled along
+        each axis, minus the cell itself. Offsets are taken modulo the grid
+        size, so a radius that wraps around the grid counts each cell once,
+        as NeighborTypeCounts does.
+        """
+        width, height = self.cells.shape
+        x_offsets = {dx % width for dx in range(-self.radius, self.radius + 1)}
+        y_offsets = {dy % height for dy in range(-self.radius, self.radius + 1)}
+        similar = np.zeros(self.cells.shape, dtype=np.int32)
+        for agent_type in (0, 1):
+            mask = (self.cells == agent_type).astype(np.int32)
+            rows = sum(np.roll(mask, dx, axis=0) for dx in x_offsets)
+            block = sum(np.roll(rows, dy, axis=1) for dy in y_offsets)
+            similar += np.where(mask, block - mask, 0)
+        return similar
+
+    def move_unhappy(self):
+        """
+        Find the unhappy agents and move them all at once: the cells they
+        leave join the empty cells, and the unhappy agents are shuffled into
+        a random choice of those cells.
+        """
+        occupied = self.cells != EMPTY
+        unhappy = occupied & (self.similar_counts() < self.homophily)
+        moving = np.flatnonzero(unhappy)
+        self.happy = self.num_agents - len(moving)
+        if not len(moving):
+            return
+        cells = self.cells.reshape(-1)
+        types = cells[moving]
+        free = np.concatenate((np.flatnonzero(~occupied), moving))
+        cells[moving] = EMPTY
+        cells[self.rng.choice(free, len(moving), replace=False)] = types
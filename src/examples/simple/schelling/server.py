@@ -50,6 +50,9 @@ model_params = {
     "radius": mesa.visualization.Slider(
         name="Search Radius", value=1, min_value=1, max_value=5, step=1
     ),
+    "engine": mesa.visualization.Choice(
+        "Engine", value="object", choices=list(Schelling.engines)
+    ),
 }
 
 server = mesa.visualization.ModularServer(
@@ -0,0 +1,28 @@
+from functools import partial
+
+import pytest
+from examples_shared.checkpoint import assert_checkpoint_resumes_identically
+from model import EMPTY, Schelling
+
+
+def test_checkpoint_resumes_identically():
+    model, restored = assert_checkpoint_resumes_identically(
+        partial(Schelling, width=30, height=30, seed=1), steps=3
+    )
+    assert sorted((a.unique_id, a.pos) for a in restored.agents) == sorted(
+        (a.unique_id, a.pos) for a in model.agents
+    )
+
+
+@pytest.mark.parametrize("radius", [1, 2, 3])
+def test_numpy_similar_counts_match_object_engine(radius):
+    # On a 3x4 grid, radii of 2 and more wrap around onto cells already
+    # counted.
+    model = Schelling(width=3, height=4, radius=radius, seed=2)
+    array_model = Schelling(width=3, height=4, radius=radius, engine="numpy")
+    array_model.cells.fill(EMPTY)
+    for agent in model.agents:
+        array_model.cells[agent.pos] = agent.type
+    similar = array_model.similar_counts()
+    for agent in model.agents:
+        assert similar[agent.pos] == model.type_counts.count(agent.type, agent.pos)
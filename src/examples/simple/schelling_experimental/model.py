@@ -1,4 +1,5 @@
 import mesa
+from examples_shared.lattice import NeighborTypeCounts
 
 
 class SchellingAgent(mesa.Agent):
@@ -20,14 +21,14 @@ class SchellingAgent(mesa.Agent):
         self.type = agent_type
 
     def step(self):
-        similar = 0
-        for neighbor in self.model.grid.iter_neighbors(self.pos, True):
-            if neighbor.type == self.type:
-                similar += 1
+        similar = self.model.type_counts.count(self.type, self.pos)
 
         # If unhappy, move:
         if similar < self.model.homophily:
-            self.model.grid.move_to_empty(self)
+            new_pos = self.model.type_counts.move_to_empty(
+                self.type, self.pos, self.random
+            )
+            self.model.grid.move_agent(self, new_pos)
         else:
             self.model.happy += 1
 
@@ -45,6 +46,11 @@ class Schelling(mesa.Model):
 
         self.grid = mesa.space.SingleGrid(width, height, torus=True)
 
+        # Number of agents of each type around every cell, updated as agents
+        # move, so an agent counts its similar neighbors with one lookup
+        # instead of a scan of its neighbors; and the pool of empty cells.
+        self.type_counts = NeighborTypeCounts(width, height)
+
         self.happy = 0
         self.datacollector = mesa.DataCollector(
             {"happy": "happy"},  # Model-level count of happy agents
@@ -59,6 +65,9 @@ class Schelling(mesa.Model):
                 agent_type = 1 if self.random.random() < minority_pc else 0
                 agent = SchellingAgent(pos, self, agent_type)
                 self.grid.place_agent(agent, pos)
+                self.type_counts.place(agent_type, pos)
+            else:
+                self.type_counts.empty_cells.append(pos)
 
         self.datacollector.collect(self)
 
@@ -1,6 +1,8 @@
+import functools
 import math
 
 import mesa
+import numpy as np
 
 
 def get_distance(pos_1, pos_2):
@@ -16,6 +18,28 @@ def get_distance(pos_1, pos_2):
     return math.sqrt(dx**2 + dy**2)
 
 
+@functools.lru_cache(maxsize=None)
+def get_neighborhood_offsets(moore, radius):
+    """Get the (dx, dy) offsets of a neighborhood, center excluded, in the
+    order mesa's grid.get_neighborhood lists the cells, and the distance of
+    each offset from the center.
+
+    Args:
+        moore: If True, Moore neighborhood, otherwise Von Neumann.
+        radius: Radius of the neighborhood.
+    """
+    offsets = np.array(
+        [
+            (dx, dy)
+            for dx in range(-radius, radius + 1)
+            for dy in range(-radius, radius + 1)
+            if (moore or abs(dx) + abs(dy) <= radius) and (dx, dy) != (0, 0)
+        ]
+    )
+    distances = np.array([get_distance((0, 0), offset) for offset in offsets])
+    return offsets, distances
+
+
 class SsAgent(mesa.Agent):
     def __init__(
         self, unique_id, pos, model, moore=False, sugar=0, metabolism=0, vision=0
@@ -27,57 +51,43 @@ class SsAgent(mesa.Agent):
         self.metabolism = metabolism
         self.vision = vision
 
-    def get_sugar(self, pos):
-        this_cell = self.model.grid.get_cell_list_contents([pos])
-        for agent in this_cell:
-            if type(agent) is Sugar:
-                return agent
-
-    def is_occupied(self, pos):
-        this_cell = self.model.grid.get_cell_list_contents([pos])
-        return any(isinstance(agent, SsAgent) for agent in this_cell)
-
     def move(self):
         # Get neighborhood within vision
-        neighbors = [
-            i
-            for i in self.model.grid.get_neighborhood(
-                self.pos, self.moore, False, radius=self.vision
-            )
-            if not self.is_occupied(i)
-        ]
-        neighbors.append(self.pos)
+        offsets, distances = get_neighborhood_offsets(self.moore, self.vision)
+        x, y = self.pos
+        xs = offsets[:, 0] + x
+        ys = offsets[:, 1] + y
+        in_grid = (
+            (xs >= 0) & (xs < self.model.width) & (ys >= 0) & (ys < self.model.height)
+        )
+        xs, ys, distances = xs[in_grid], ys[in_grid], distances[in_grid]
+        unoccupied = self.model.occupancy[xs, ys] == 0
+        # The agent's own cell comes last, at distance 0
+        xs = np.append(xs[unoccupied], x)
+        ys = np.append(ys[unoccupied], y)
+        distances = np.append(distances[unoccupied], 0.0)
         # Look for location with the most sugar
-        max_sugar = max(self.get_sugar(pos).amount for pos in neighbors)
-        candidates = [
-            pos for pos in neighbors if self.get_sugar(pos).amount == max_sugar
-        ]
+        amounts = self.model.sugar_amount[xs, ys]
+        candidates = amounts == amounts.max()
         # Narrow down to the nearest ones
-        min_dist = min(get_distance(self.pos, pos) for pos in candidates)
-        final_candidates = [
-            pos for pos in candidates if get_distance(self.pos, pos) == min_dist
-        ]
+        min_dist = distances[candidates].min()
+        final_candidates = candidates & (distances == min_dist)
+        final_candidates = list(
+            zip(xs[final_candidates].tolist(), ys[final_candidates].tolist())
+        )
         self.random.shuffle(final_candidates)
+        self.model.occupancy[self.pos] -= 1
         self.model.grid.move_agent(self, final_candidates[0])
+        self.model.occupancy[self.pos] += 1
 
     def eat(self):
-        sugar_patch = self.get_sugar(self.pos)
-        self.sugar = self.sugar - self.metabolism + sugar_patch.amount
-        sugar_patch.amount = 0
+        self.sugar = self.sugar - self.metabolism + self.model.sugar_amount[self.pos]
+        self.model.sugar_amount[self.pos] = 0
 
     def step(self):
         self.move()
         self.eat()
         if self.sugar <= 0:
+            self.model.occupancy[self.pos] -= 1
             self.model.grid.remove_agent(self)
             self.model.schedule.remove(self)
-
-
-class Sugar(mesa.Agent):
-    def __init__(self, unique_id, pos, model, max_sugar):
-        super().__init__(unique_id, model)
-        self.amount = max_sugar
-        self.max_sugar = max_sugar
-
-    def step(self):
-        self.amount = min([self.max_sugar, self.amount + 1])
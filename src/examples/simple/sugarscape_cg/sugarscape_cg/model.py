@@ -12,8 +12,9 @@ Northwestern University, Evanston, IL.
 from pathlib import Path
 
 import mesa
+import numpy as np
 
-from .agents import SsAgent, Sugar
+from .agents import SsAgent
 
 
 class SugarscapeCg(mesa.Model):
@@ -43,17 +44,13 @@ class SugarscapeCg(mesa.Model):
             {"SsAgent": lambda m: m.schedule.get_type_count(SsAgent)}
         )
 
-        # Create sugar
-        import numpy as np
-
-        sugar_distribution = np.genfromtxt(Path(__file__).parent / "sugar-map.txt")
+        # Create sugar: the maximum and current amount of sugar on each cell,
+        # indexed by (x, y)
+        self.max_sugar = np.genfromtxt(Path(__file__).parent / "sugar-map.txt")
+        self.sugar_amount = self.max_sugar.copy()
+        # number of SsAgents on each cell, indexed by (x, y)
+        self.occupancy = np.zeros((self.width, self.height), dtype=int)
         agent_id = 0
-        for _, (x, y) in self.grid.coord_iter():
-            max_sugar = sugar_distribution[x, y]
-            sugar = Sugar(agent_id, (x, y), self, max_sugar)
-            agent_id += 1
-            self.grid.place_agent(sugar, (x, y))
-            self.schedule.add(sugar)
 
         # Create agent:
         for i in range(self.initial_population):
@@ -65,13 +62,19 @@ class SugarscapeCg(mesa.Model):
             ssa = SsAgent(agent_id, (x, y), self, False, sugar, metabolism, vision)
             agent_id += 1
             self.grid.place_agent(ssa, (x, y))
+            self.occupancy[x, y] += 1
             self.schedule.add(ssa)
 
         self.running = True
         self.datacollector.collect(self)
 
+    def grow_sugar(self):
+        """Grow back one unit of sugar on every cell, up to its maximum."""
+        np.minimum(self.sugar_amount + 1, self.max_sugar, out=self.sugar_amount)
+
     def step(self):
         self.schedule.step()
+        self.grow_sugar()
         # collect data
         self.datacollector.collect(self)
         if self.verbose:
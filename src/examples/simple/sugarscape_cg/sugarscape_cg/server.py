@@ -1,6 +1,7 @@
 import mesa
+import numpy as np
 
-from .agents import SsAgent, Sugar
+from .agents import SsAgent
 from .model import SugarscapeCg
 
 color_dic = {4: "#005C00", 3: "#008300", 2: "#00AA00", 1: "#00F800"}
@@ -13,21 +14,38 @@ def SsAgent_portrayal(agent):
     if type(agent) is SsAgent:
         return {"Shape": "sugarscape_cg/resources/ant.png", "scale": 0.9, "Layer": 1}
 
-    elif type(agent) is Sugar:
-        color = color_dic[agent.amount] if agent.amount != 0 else "#D6F5D6"
-        return {
-            "Color": color,
-            "Shape": "rect",
-            "Filled": "true",
-            "Layer": 0,
-            "w": 1,
-            "h": 1,
-        }
-
     return {}
 
 
-canvas_element = mesa.visualization.CanvasGrid(SsAgent_portrayal, 50, 50, 500, 500)
+def sugar_portrayal(amount):
+    color = color_dic[amount] if amount != 0 else "#D6F5D6"
+    return {
+        "Color": color,
+        "Shape": "rect",
+        "Filled": "true",
+        "Layer": 0,
+        "w": 1,
+        "h": 1,
+    }
+
+
+class SugarscapeCanvasGrid(mesa.visualization.CanvasGrid):
+    """
+    A CanvasGrid that also draws the model's sugar layer, which is an array
+    rather than agents on the grid.
+    """
+
+    def render(self, model):
+        grid_state = super().render(model)
+        for (x, y), amount in np.ndenumerate(model.sugar_amount):
+            portrayal = sugar_portrayal(amount)
+            portrayal["x"] = x
+            portrayal["y"] = y
+            grid_state[portrayal["Layer"]].append(portrayal)
+        return grid_state
+
+
+canvas_element = SugarscapeCanvasGrid(SsAgent_portrayal, 50, 50, 500, 500)
 chart_element = mesa.visualization.ChartModule(
     [{"Label": "SsAgent", "Color": "#AA0000"}]
 )
@@ -19,14 +19,11 @@ def space_drawer(model, agent_portrayal):
                 if isinstance(agent, Trader):
                     layers["trader"]["x"].append(i)
                     layers["trader"]["y"].append(j)
-                else:
-                    # Don't visualize resource with value <= 1.
-                    layers["sugar"][i][j] = (
-                        agent.sugar_amount if agent.sugar_amount > 1 else np.nan
-                    )
-                    layers["spice"][i][j] = (
-                        agent.spice_amount if agent.spice_amount > 1 else np.nan
-                    )
+            # Don't visualize resource with value <= 1.
+            sugar_amount = model.sugar_amount[i, j]
+            spice_amount = model.spice_amount[i, j]
+            layers["sugar"][i][j] = sugar_amount if sugar_amount > 1 else np.nan
+            layers["spice"][i][j] = spice_amount if spice_amount > 1 else np.nan
         return layers
 
     fig = Figure()
@@ -1,22 +1,22 @@
 import sys
 
 import matplotlib.pyplot as plt
-import mesa
 import networkx as nx
 import pandas as pd
 from sugarscape_g1mt.model import SugarscapeG1mt
 from sugarscape_g1mt.server import server
+from sugarscape_g1mt.sweep import sweep
 
 
 # Analysis
-def assess_results(results, single_agent):
+def assess_results(results, trade_log, num_agents=None):
     # Make dataframe of results
     results_df = pd.DataFrame(results)
     # Plot and show  mean price
     plt.scatter(results_df["Step"], results_df["Price"], s=0.75)
     plt.show()
 
-    if single_agent is not None:
+    if trade_log is not None:
         plt.plot(results_df["Step"], results_df["Trader"])
         plt.show()
     else:
@@ -27,22 +27,14 @@ def assess_results(results, single_agent):
             plt.plot(results_explore["Step"], results_explore["Trader"])
         plt.show()
 
-    if single_agent is not None:
-        results_df = single_agent
+    if trade_log is None:
+        # batch runs only return datacollector data, so there is no trade log
+        return
 
     # Show Trade Networks
-    #  create graph object
+    #  create graph object from the sparse adjacency matrix of all trades
     print("Making Network")
-    G = nx.Graph()
-    trade = results_df.dropna(subset=["Trade Network"])
-    # add agent keys to make initial node set
-    G.add_nodes_from(list(trade["AgentID"].unique()))
-
-    # create edge list
-    for idx, row in trade.iterrows():
-        if len(row["Trade Network"]) > 0:
-            for agent in row["Trade Network"]:
-                G.add_edge(row["AgentID"], agent)
+    G = nx.from_scipy_sparse_array(trade_log.adjacency(num_agents))
 
     # Get Basic Network Statistics
     print(f"Node Connectivity {nx.node_connectivity(G)}")
@@ -77,10 +69,8 @@ elif args[0] == "-s":
     model_results = model.datacollector.get_model_vars_dataframe()
     # Convert to make similar to batch_run_results
     model_results["Step"] = model_results.index
-    agent_results = model.datacollector.get_agent_vars_dataframe()
-    agent_results = agent_results.reset_index()
     # assess the results
-    assess_results(model_results, agent_results)
+    assess_results(model_results, model.trade_log, model.initial_population)
 
 elif args[0] == "-b":
     print("Conducting a Batch Run")
@@ -92,15 +82,20 @@ elif args[0] == "-b":
         "metabolism_max": [2, 3, 4, 5],
     }
 
-    results_batch = mesa.batch_run(
-        SugarscapeG1mt,
+    # runs are spread over all CPUs and streamed to disk as they finish;
+    # rerunning after an interruption skips the runs already saved
+    results_file = sweep(
         parameters=params,
+        output="sugarscape_sweep.csv",
         iterations=1,
-        number_processes=1,
         data_collection_period=1,
         display_progress=True,
     )
 
+    # only load the columns needed for the plots
+    results_batch = pd.read_csv(
+        results_file, usecols=["RunId", "Step", "Price", "Trader"]
+    )
     assess_results(results_batch, None)
 
 else:
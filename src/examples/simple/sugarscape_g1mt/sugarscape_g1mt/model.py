@@ -3,7 +3,7 @@ from pathlib import Path
 import mesa
 import numpy as np
 
-from .resource_agents import Resource
+from .trade_log import TradeLog
 from .trader_agents import Trader
 
 
@@ -23,16 +23,19 @@ def geometric_mean(list_of_prices):
     return np.exp(np.log(list_of_prices).mean())
 
 
-def get_trade(agent):
-    """
-    For agent reporters in data collector
+# Model reporters
+def count_traders(model):
+    return model.schedule.get_type_count(Trader)
+
+
+def trade_volume(model):
+    return model.trade_log.volume(model._steps)
 
-    return list of trade partners and None for other agents
-    """
-    if isinstance(agent, Trader):
-        return agent.trade_partners
-    else:
-        return None
+
+def mean_price(model):
+    return geometric_mean(
+        flatten([a.prices for a in model.schedule.agents_by_type[Trader].values()])
+    )
 
 
 class SugarscapeG1mt(mesa.Model):
@@ -52,6 +55,7 @@ class SugarscapeG1mt(mesa.Model):
         vision_min=1,
         vision_max=5,
         enable_trade=True,
+        trade_log_dir=None,
     ):
         super().__init__()
         # Initiate width and heigh of sugarscape
@@ -67,6 +71,8 @@ class SugarscapeG1mt(mesa.Model):
         self.vision_max = vision_max
         self.enable_trade = enable_trade
         self.running = True
+        # record of every trade, kept on disk under trade_log_dir if given
+        self.trade_log = TradeLog(spill_dir=trade_log_dir)
 
         # initiate activation schedule
         self.schedule = mesa.time.RandomActivationByType(self)
@@ -75,33 +81,23 @@ class SugarscapeG1mt(mesa.Model):
         # initiate datacollector
         self.datacollector = mesa.DataCollector(
             model_reporters={
-                "Trader": lambda m: m.schedule.get_type_count(Trader),
-                "Trade Volume": lambda m: sum(
-                    len(a.trade_partners)
-                    for a in m.schedule.agents_by_type[Trader].values()
-                ),
-                "Price": lambda m: geometric_mean(
-                    flatten(
-                        [a.prices for a in m.schedule.agents_by_type[Trader].values()]
-                    )
-                ),
+                "Trader": count_traders,
+                "Trade Volume": trade_volume,
+                "Price": mean_price,
             },
-            agent_reporters={"Trade Network": lambda a: get_trade(a)},
         )
 
         # read in landscape file from supplmentary material
-        sugar_distribution = np.genfromtxt(Path(__file__).parent / "sugar-map.txt")
-        spice_distribution = np.flip(sugar_distribution, 1)
+        # the resource layers are indexed by (x, y): the maximum and current
+        # amount of sugar and spice on each cell
+        self.max_sugar = np.genfromtxt(Path(__file__).parent / "sugar-map.txt")
+        self.max_spice = np.flip(self.max_sugar, 1).copy()
+        self.sugar_amount = self.max_sugar.copy()
+        self.spice_amount = self.max_spice.copy()
+        # number of traders on each cell, indexed by (x, y)
+        self.occupancy = np.zeros((self.width, self.height), dtype=int)
 
         agent_id = 0
-        for _, (x, y) in self.grid.coord_iter():
-            max_sugar = sugar_distribution[x, y]
-            max_spice = spice_distribution[x, y]
-            resource = Resource(agent_id, self, (x, y), max_sugar, max_spice)
-            self.schedule.add(resource)
-            self.grid.place_agent(resource, (x, y))
-            agent_id += 1
-
         for i in range(self.initial_population):
             # get agent position
             x = self.random.randrange(self.width)
@@ -133,6 +129,7 @@ class SugarscapeG1mt(mesa.Model):
             )
             # place agent
             self.grid.place_agent(trader, (x, y))
+            self.occupancy[x, y] += 1
             self.schedule.add(trader)
             agent_id += 1
 
@@ -148,14 +145,21 @@ class SugarscapeG1mt(mesa.Model):
 
         return traders_shuffle
 
+    def grow_resources(self):
+        """
+        Growth function, adds one unit of sugar and spice to every cell up to
+        its max amount
+        """
+        np.minimum(self.sugar_amount + 1, self.max_sugar, out=self.sugar_amount)
+        np.minimum(self.spice_amount + 1, self.max_spice, out=self.spice_amount)
+
     def step(self):
         """
         Unique step function that does staged activation of sugar and spice
         and then randomly activates traders
         """
-        # step Resource agents
-        for resource in self.schedule.agents_by_type[Resource].values():
-            resource.step()
+        # grow sugar and spice
+        self.grow_resources()
 
         # step trader agents
         # to account for agent death and removal we need a seperate data strcuture to
@@ -164,7 +168,6 @@ class SugarscapeG1mt(mesa.Model):
 
         for agent in trader_shuffle:
             agent.prices = []
-            agent.trade_partners = []
             agent.move()
             agent.eat()
             agent.maybe_die()
@@ -183,24 +186,6 @@ class SugarscapeG1mt(mesa.Model):
         self._steps += 1
         # collect model level data
         self.datacollector.collect(self)
-        """
-        Mesa is working on updating datacollector agent reporter
-        so it can collect information on specific agents from
-        mesa.time.RandomActivationByType.
-
-        Please see issue #1419 at
-        https://github.com/projectmesa/mesa/issues/1419
-        (contributions welcome)
-
-        Below is one way to update agent_records to get specific Trader agent data
-        """
-        # Need to remove excess data
-        # Create local variable to store trade data
-        agent_trades = self.datacollector._agent_records[self._steps]
-        # Get rid of all None to reduce data storage needs
-        agent_trades = [agent for agent in agent_trades if agent[2] is not None]
-        # Reassign the dictionary value with lean trade data
-        self.datacollector._agent_records[self._steps] = agent_trades
 
     def run_model(self, step_count=1000):
         for i in range(step_count):
@@ -1,7 +1,6 @@
 import mesa
 
 from .model import SugarscapeG1mt
-from .resource_agents import Resource
 from .trader_agents import Trader
 
 sugar_dic = {4: "#005C00", 3: "#008300", 2: "#00AA00", 1: "#00F800"}
@@ -21,31 +20,46 @@ def Agent_portrayal(agent):
             "Color": "#FF0A01",
         }
 
-    elif isinstance(agent, Resource):
-        resource_type = "sugar" if agent.max_sugar > agent.max_spice else "spice"
-        if resource_type == "sugar":
-            color = (
-                sugar_dic[agent.sugar_amount] if agent.sugar_amount != 0 else "#D6F5D6"
-            )
-            layer = 1 if agent.sugar_amount > 2 else 0
-        else:
-            color = (
-                spice_dic[agent.spice_amount] if agent.spice_amount != 0 else "#D6F5D6"
-            )
-            layer = 1 if agent.spice_amount > 2 else 0
-        return {
-            "Color": color,
-            "Shape": "rect",
-            "Filled": "true",
-            "Layer": layer,
-            "w": 1,
-            "h": 1,
-        }
-
     return {}
 
 
-canvas_element = mesa.visualization.CanvasGrid(Agent_portrayal, 50, 50, 500, 500)
+def resource_portrayal(model, pos):
+    resource_type = "sugar" if model.max_sugar[pos] > model.max_spice[pos] else "spice"
+    if resource_type == "sugar":
+        amount = model.sugar_amount[pos]
+        color = sugar_dic[amount] if amount != 0 else "#D6F5D6"
+    else:
+        amount = model.spice_amount[pos]
+        color = spice_dic[amount] if amount != 0 else "#D6F5D6"
+    layer = 1 if amount > 2 else 0
+    return {
+        "Color": color,
+        "Shape": "rect",
+        "Filled": "true",
+        "Layer": layer,
+        "w": 1,
+        "h": 1,
+    }
+
+
+class SugarscapeCanvasGrid(mesa.visualization.CanvasGrid):
+    """
+    A CanvasGrid that also draws the model's sugar and spice layers, which are
+    arrays rather than agents on the grid.
+    """
+
+    def render(self, model):
+        grid_state = super().render(model)
+        for x in range(model.width):
+            for y in range(model.height):
+                portrayal = resource_portrayal(model, (x, y))
+                portrayal["x"] = x
+                portrayal["y"] = y
+                grid_state[portrayal["Layer"]].append(portrayal)
+        return grid_state
+
+
+canvas_element = SugarscapeCanvasGrid(Agent_portrayal, 50, 50, 500, 500)
 chart_element = mesa.visualization.ChartModule(
     [{"Label": "Trader", "Color": "#AA0000"}]
 )
@@ -0,0 +1,159 @@
+import csv
+import itertools
+import json
+import os
+from multiprocessing import Pool
+from pathlib import Path
+
+from tqdm.auto import tqdm
+
+from .model import SugarscapeG1mt
+
+
+def make_runs(parameters, iterations):
+    """
+    helper function for sweep()
+
+    returns every (run_id, iteration, kwargs) combination, in the same order
+    as mesa.batch_run
+    """
+    values = [
+        [values] if isinstance(values, str) or not _iterable(values) else values
+        for values in parameters.values()
+    ]
+    configurations = [
+        dict(zip(parameters, combination)) for combination in itertools.product(*values)
+    ]
+    runs = []
+    for iteration in range(iterations):
+        for kwargs in configurations:
+            runs.append((len(runs), iteration, kwargs))
+    return runs
+
+
+def _iterable(value):
+    try:
+        iter(value)
+    except TypeError:
+        return False
+    return True
+
+
+def run_key(iteration, kwargs):
+    """
+    identifies a run by its parameters and iteration, independent of run order
+    """
+    return json.dumps([iteration, kwargs], sort_keys=True, default=str)
+
+
+def run_model(run, max_steps, data_collection_period):
+    """
+    runs one model and returns its key and its per-step rows
+    """
+    run_id, iteration, kwargs = run
+    model = SugarscapeG1mt(**kwargs)
+    while model.running and model._steps < max_steps:
+        model.step()
+
+    model_vars = model.datacollector.model_vars
+    collected = len(next(iter(model_vars.values()), []))
+    steps = list(range(0, collected, data_collection_period))
+    if collected and steps[-1] != collected - 1:
+        steps.append(collected - 1)
+
+    rows = [
+        {
+            "RunId": run_id,
+            "iteration": iteration,
+            "Step": step,
+            **kwargs,
+            **{name: values[step] for name, values in model_vars.items()},
+        }
+        for step in steps
+    ]
+    return run_key(iteration, kwargs), rows
+
+
+def _run_model_star(args):
+    return run_model(*args)
+
+
+def sweep(
+    parameters,
+    output,
+    iterations=1,
+    max_steps=1000,
+    data_collection_period=1,
+    number_processes=None,
+    display_progress=True,
+):
+    """
+    Runs SugarscapeG1mt over every combination of parameters and streams the
+    collected model data of each run to the CSV file output as it completes
+
+    Runs are spread over a pool of number_processes workers (all CPUs if
+    None), so only the rows of the runs in flight are held in memory.
+    Finished runs are listed, with the file size after their rows, in a
+    manifest next to output. Calling sweep again with the same arguments
+    drops any partly written rows and skips the runs already listed.
+
+    returns the path of the CSV file
+    """
+    output = Path(output)
+    manifest = output.with_name(output.name + ".done")
+
+    done = set()
+    size = 0
+    if manifest.exists() and output.exists():
+        with open(manifest) as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # interrupted while listing this run
+                    break
+                entry = json.loads(line)
+                done.add(entry["key"])
+                size = entry["size"]
+    else:
+        manifest.unlink(missing_ok=True)
+
+    header = None
+    if size:
+        with open(output, newline="") as f:
+            header = next(csv.reader(f))
+    with open(output, "a+b") as f:
+        f.truncate(size)
+
+    pending = [
+        (run, max_steps, data_collection_period)
+        for run in make_runs(parameters, iterations)
+        if run_key(run[1], run[2]) not in done
+    ]
+
+    with open(output, "a", newline="") as out, open(manifest, "a") as log, tqdm(
+        total=len(pending), disable=not display_progress
+    ) as pbar:
+        writer = None if header is None else csv.DictWriter(out, header)
+
+        def save(key, rows):
+            nonlocal writer
+            if rows:
+                if writer is None:
+                    writer = csv.DictWriter(out, list(rows[0]))
+                    writer.writeheader()
+                writer.writerows(rows)
+            out.flush()
+            os.fsync(out.fileno())
+            size = os.fstat(out.fileno()).st_size
+            log.write(json.dumps({"key": key, "size": size}) + "\n")
+            log.flush()
+            pbar.update()
+
+        if number_processes == 1:
+            for args in pending:
+                save(*_run_model_star(args))
+        else:
+            with Pool(number_processes) as pool:
+                for key, rows in pool.imap_unordered(_run_model_star, pending):
+                    save(key, rows)
+
+    return output
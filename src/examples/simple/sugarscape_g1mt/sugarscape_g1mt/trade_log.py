@@ -0,0 +1,147 @@
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse
+
+COLUMNS = {
+    "step": np.int64,
+    "seller": np.int64,
+    "buyer": np.int64,
+    "price": np.float64,
+    "qty": np.int64,
+}
+
+
+class TradeLog:
+    """
+    Columnar log of the trades made during a run
+
+    Each row is one trading session between two traders:
+    - step: the step the trade happened in, counting from 1
+    - seller: unique_id of the trader selling spice
+    - buyer: unique_id of the trader buying spice (and selling sugar)
+    - price: geometric mean of the unit prices of the session
+    - qty: number of units traded in the session
+
+    Rows are written into preallocated NumPy column chunks of chunk_size rows.
+    If spill_dir is given, every full chunk is written to disk there and only
+    the chunk being filled is kept in memory.
+    """
+
+    def __init__(self, chunk_size=4096, spill_dir=None):
+        self.chunk_size = chunk_size
+        self.spill_dir = None if spill_dir is None else Path(spill_dir)
+        if self.spill_dir is not None:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+        # full chunks, either dicts of column arrays or paths to spilled files
+        self._chunks = []
+        self._current = self._new_chunk()
+        self._length = 0
+        # step -> (first row, end row); steps are appended in order
+        self._step_rows = {}
+
+    def _new_chunk(self):
+        return {
+            name: np.empty(self.chunk_size, dtype=dtype)
+            for name, dtype in COLUMNS.items()
+        }
+
+    def __len__(self):
+        return self._length
+
+    def append(self, step, seller, buyer, price, qty):
+        """
+        add one trade to the log
+        """
+        row = self._length % self.chunk_size
+        chunk = self._current
+        chunk["step"][row] = step
+        chunk["seller"][row] = seller
+        chunk["buyer"][row] = buyer
+        chunk["price"][row] = price
+        chunk["qty"][row] = qty
+
+        start, _ = self._step_rows.get(step, (self._length, None))
+        self._length += 1
+        self._step_rows[step] = (start, self._length)
+
+        if row == self.chunk_size - 1:
+            self._flush()
+
+    def _flush(self):
+        """
+        helper function for self.append()
+
+        stores the full current chunk and starts a new one
+        """
+        if self.spill_dir is None:
+            self._chunks.append(self._current)
+            self._current = self._new_chunk()
+        else:
+            path = self.spill_dir / f"trades-{len(self._chunks):06d}.npz"
+            np.savez(path, **self._current)
+            self._chunks.append(path)
+            # the chunk is on disk, so its buffers can be filled again
+
+    def _load_chunk(self, index):
+        if index == len(self._chunks):
+            return self._current
+        chunk = self._chunks[index]
+        if isinstance(chunk, Path):
+            with np.load(chunk) as data:
+                return {name: data[name] for name in COLUMNS}
+        return chunk
+
+    def columns(self, start=0, stop=None):
+        """
+        returns a dict of column arrays for the rows in [start, stop)
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        parts = {name: [] for name in COLUMNS}
+        first_chunk = start // self.chunk_size
+        last_chunk = (stop - 1) // self.chunk_size
+        for index in range(first_chunk, last_chunk + 1):
+            chunk = self._load_chunk(index)
+            offset = index * self.chunk_size
+            lo = max(start - offset, 0)
+            hi = min(stop - offset, self.chunk_size)
+            for name in COLUMNS:
+                parts[name].append(chunk[name][lo:hi])
+        return {
+            name: np.concatenate(arrays) if arrays else np.empty(0, dtype=dtype)
+            for (name, arrays), dtype in zip(parts.items(), COLUMNS.values())
+        }
+
+    def edges(self, step):
+        """
+        returns the trades of one step as a dict of column arrays
+        """
+        start, stop = self._step_rows.get(step, (0, 0))
+        return self.columns(start, stop)
+
+    def volume(self, step):
+        """
+        returns the number of units traded during one step
+        """
+        return int(self.edges(step)["qty"].sum())
+
+    def adjacency(self, num_agents=None, weight="qty", directed=False):
+        """
+        builds a sparse adjacency matrix of the trade network
+
+        num_agents sets the matrix size and defaults to the highest trader id
+        seen plus one. Entry [seller, buyer] holds the sum of weight over all
+        of their trades, or the number of trades if weight is None. Unless
+        directed is True, the matrix is symmetric.
+        """
+        data = self.columns()
+        rows, cols = data["seller"], data["buyer"]
+        if num_agents is None:
+            num_agents = int(max(rows.max(initial=-1), cols.max(initial=-1))) + 1
+        values = np.ones(len(rows)) if weight is None else data[weight]
+        if not directed:
+            rows, cols = np.concatenate((rows, cols)), np.concatenate((cols, rows))
+            values = np.concatenate((values, values))
+        return scipy.sparse.coo_array(
+            (values, (rows, cols)), shape=(num_agents, num_agents)
+        ).tocsr()
@@ -1,11 +1,11 @@
+import functools
 import math
 
 import mesa
+import numpy as np
 
-from .resource_agents import Resource
 
-
-# Helper function
+# Helper functions
 def get_distance(pos_1, pos_2):
     """
     Calculate the Euclidean distance between two positions
@@ -20,6 +20,38 @@ def get_distance(pos_1, pos_2):
     return math.sqrt(dx**2 + dy**2)
 
 
+@functools.lru_cache(maxsize=None)
+def get_neighborhood_offsets(moore, radius):
+    """
+    Precomputed (dx, dy) offsets of a neighborhood, center included, in the
+    order mesa's grid.get_neighborhood lists the cells, together with the
+    distance of each offset from the center.
+
+    used in trade.move()
+    """
+
+    offsets = np.array(
+        [
+            (dx, dy)
+            for dx in range(-radius, radius + 1)
+            for dy in range(-radius, radius + 1)
+            if moore or abs(dx) + abs(dy) <= radius
+        ]
+    )
+    distances = np.array([get_distance((0, 0), offset) for offset in offsets])
+    return offsets, distances
+
+
+def isclose(a, b, rel_tol=1e-09):
+    """
+    Element-wise math.isclose for numpy arrays
+
+    used in trade.move()
+    """
+
+    return np.abs(a - b) <= rel_tol * np.maximum(np.abs(a), np.abs(b))
+
+
 class Trader(mesa.Agent):
     """
     Trader:
@@ -48,14 +80,6 @@ class Trader(mesa.Agent):
         self.metabolism_spice = metabolism_spice
         self.vision = vision
         self.prices = []
-        self.trade_partners = []
-
-    def get_resource(self, pos):
-        this_cell = self.model.grid.get_cell_list_contents(pos)
-        for agent in this_cell:
-            if type(agent) is Resource:
-                return agent
-        raise Exception(f"Resource agent not found in the position {pos}")
 
     def get_trader(self, pos):
         """
@@ -76,9 +100,7 @@ class Trader(mesa.Agent):
         if pos == self.pos:
             # agent's position is considered unoccupied as agent can stay there
             return False
-        # get contents of each cell in neighborhood
-        this_cell = self.model.grid.get_cell_list_contents(pos)
-        return any(isinstance(a, Trader) for a in this_cell)
+        return self.model.occupancy[pos] > 0
 
     def calculate_welfare(self, sugar, spice):
         """
@@ -143,6 +165,10 @@ class Trader(mesa.Agent):
     def maybe_sell_spice(self, other, price, welfare_self, welfare_other):
         """
         helper function for self.trade()
+
+        returns None if the trade criteria are not met, otherwise executes the
+        trade and returns both agents' welfare and MRS after it as
+        (welfare_self, welfare_other, mrs_self, mrs_other)
         """
 
         sugar_exchanged, spice_exchanged = self.calculate_sell_spice_amount(price)
@@ -161,31 +187,40 @@ class Trader(mesa.Agent):
             or (self_spice <= 0)
             or (other_spice <= 0)
         ):
-            return False
+            return None
 
         # trade criteria #1 - are both agents better off?
-        both_agents_better_off = (
-            welfare_self < self.calculate_welfare(self_sugar, self_spice)
-        ) and (welfare_other < other.calculate_welfare(other_sugar, other_spice))
+        new_welfare_self = self.calculate_welfare(self_sugar, self_spice)
+        new_welfare_other = other.calculate_welfare(other_sugar, other_spice)
+        both_agents_better_off = (welfare_self < new_welfare_self) and (
+            welfare_other < new_welfare_other
+        )
 
         # trade criteria #2 is their mrs crossing with potential trade
-        mrs_not_crossing = self.calculate_MRS(
-            self_sugar, self_spice
-        ) > other.calculate_MRS(other_sugar, other_spice)
+        new_mrs_self = self.calculate_MRS(self_sugar, self_spice)
+        new_mrs_other = other.calculate_MRS(other_sugar, other_spice)
+        mrs_not_crossing = new_mrs_self > new_mrs_other
 
         if not (both_agents_better_off and mrs_not_crossing):
-            return False
+            return None
 
         # criteria met, execute trade
         self.sell_spice(other, sugar_exchanged, spice_exchanged)
 
-        return True
+        return new_welfare_self, new_welfare_other, new_mrs_self, new_mrs_other
 
     def trade(self, other):
         """
         helper function used in trade_with_neighbors()
 
         other is a trader agent object
+
+        Agents exchange one bundle at a time, at a price set by their current
+        MRS, until a rule T end condition is met. The welfare and MRS checked
+        for each exchange are the agents' welfare and MRS once it happens, so
+        they are carried into the next round instead of being recomputed.
+
+        returns the number of exchanges made
         """
 
         # sanity check to verify code is working as expected
@@ -202,31 +237,43 @@ class Trader(mesa.Agent):
         welfare_self = self.calculate_welfare(self.sugar, self.spice)
         welfare_other = other.calculate_welfare(other.sugar, other.spice)
 
-        if math.isclose(mrs_self, mrs_other):
-            return
-
-        # calcualte price
-        price = math.sqrt(mrs_self * mrs_other)
-
-        if mrs_self > mrs_other:
-            # self is a sugar buyer, spice seller
-            sold = self.maybe_sell_spice(other, price, welfare_self, welfare_other)
-            # no trade - criteria not met
-            if not sold:
-                return
-        else:
-            # self is a spice buyer, sugar seller
-            sold = other.maybe_sell_spice(self, price, welfare_other, welfare_self)
-            # no trade - criteria not met
-            if not sold:
-                return
+        prices = []
+        while not math.isclose(mrs_self, mrs_other):
+            # calcualte price
+            price = math.sqrt(mrs_self * mrs_other)
+
+            if mrs_self > mrs_other:
+                # self is a sugar buyer, spice seller
+                seller, buyer = self, other
+                sold = self.maybe_sell_spice(other, price, welfare_self, welfare_other)
+                # no trade - criteria not met
+                if sold is None:
+                    break
+                welfare_self, welfare_other, mrs_self, mrs_other = sold
+            else:
+                # self is a spice buyer, sugar seller
+                seller, buyer = other, self
+                sold = other.maybe_sell_spice(self, price, welfare_other, welfare_self)
+                # no trade - criteria not met
+                if sold is None:
+                    break
+                welfare_other, welfare_self, mrs_other, mrs_self = sold
+
+            prices.append(price)
 
         # Capture data
-        self.prices.append(price)
-        self.trade_partners.append(other.unique_id)
+        self.prices.extend(prices)
+        if prices:
+            # MRS never cross during a session, so the seller is always the same
+            self.model.trade_log.append(
+                self.model._steps + 1,
+                seller.unique_id,
+                buyer.unique_id,
+                np.exp(np.log(prices).mean()),
+                len(prices),
+            )
 
-        # continue trading
-        self.trade(other)
+        return len(prices)
 
     ######################################################################
     #                                                                    #
@@ -245,58 +292,55 @@ class Trader(mesa.Agent):
 
         # 1. identify all possible moves
 
-        neighbors = [
-            i
-            for i in self.model.grid.get_neighborhood(
-                self.pos, self.moore, True, self.vision
-            )
-            if not self.is_occupied_by_other(i)
-        ]
+        offsets, distances = get_neighborhood_offsets(self.moore, self.vision)
+        x, y = self.pos
+        xs = offsets[:, 0] + x
+        ys = offsets[:, 1] + y
+        in_grid = (
+            (xs >= 0) & (xs < self.model.width) & (ys >= 0) & (ys < self.model.height)
+        )
+        xs, ys, distances = xs[in_grid], ys[in_grid], distances[in_grid]
+        # agent's position is considered unoccupied as agent can stay there
+        unoccupied = (self.model.occupancy[xs, ys] == 0) | ((xs == x) & (ys == y))
+        xs, ys, distances = xs[unoccupied], ys[unoccupied], distances[unoccupied]
 
         # 2. determine which move maximizes welfare
 
-        welfares = [
-            self.calculate_welfare(
-                self.sugar + self.get_resource(pos).sugar_amount,
-                self.spice + self.get_resource(pos).spice_amount,
-            )
-            for pos in neighbors
-        ]
+        welfares = self.calculate_welfare(
+            self.sugar + self.model.sugar_amount[xs, ys],
+            self.spice + self.model.spice_amount[xs, ys],
+        )
 
         # 3. Find closest best option
 
         # find the highest welfare in welfares
-        max_welfare = max(welfares)
-        # get the index of max welfare cells
-        candidate_indices = [
-            i for i in range(len(welfares)) if math.isclose(welfares[i], max_welfare)
-        ]
-
-        # convert index to positions of those cells
-        candidates = [neighbors[i] for i in candidate_indices]
+        max_welfare = welfares.max()
+        # get the max welfare cells
+        candidates = isclose(welfares, max_welfare)
 
-        min_dist = min(get_distance(self.pos, pos) for pos in candidates)
+        min_dist = distances[candidates].min()
 
-        final_candidates = [
-            pos
-            for pos in candidates
-            if math.isclose(get_distance(self.pos, pos), min_dist, rel_tol=1e-02)
-        ]
-        final_candidate = self.random.choice(final_candidates)
+        final_candidates = candidates & isclose(distances, min_dist, rel_tol=1e-02)
+        final_candidate = self.random.choice(
+            list(zip(xs[final_candidates].tolist(), ys[final_candidates].tolist()))
+        )
 
         # 4. Move Agent
+        self.model.occupancy[self.pos] -= 1
         self.model.grid.move_agent(self, final_candidate)
+        self.model.occupancy[self.pos] += 1
 
     def eat(self):
-        patch = self.get_resource(self.pos)
-        if patch.sugar_amount > 0:
-            self.sugar += patch.sugar_amount
-            patch.sugar_amount = 0
+        sugar_amount = self.model.sugar_amount[self.pos]
+        if sugar_amount > 0:
+            self.sugar += sugar_amount
+            self.model.sugar_amount[self.pos] = 0
         self.sugar -= self.metabolism_sugar
 
-        if patch.spice_amount > 0:
-            self.spice += patch.spice_amount
-            patch.spice_amount = 0
+        spice_amount = self.model.spice_amount[self.pos]
+        if spice_amount > 0:
+            self.spice += spice_amount
+            self.model.spice_amount[self.pos] = 0
         self.spice -= self.metabolism_spice
 
     def maybe_die(self):
@@ -305,6 +349,7 @@ class Trader(mesa.Agent):
         """
 
         if self.is_starved():
+            self.model.occupancy[self.pos] -= 1
             self.model.grid.remove_agent(self)
             self.model.schedule.remove(self)
 
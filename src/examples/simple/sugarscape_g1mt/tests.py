@@ -1,8 +1,14 @@
+import copy
+import math
 import random
 
 import numpy as np
+import pandas as pd
+from examples_shared.checkpoint import assert_checkpoint_resumes_identically
 from scipy import stats
 from sugarscape_g1mt.model import SugarscapeG1mt, flatten
+from sugarscape_g1mt.sweep import sweep
+from sugarscape_g1mt.trade_log import TradeLog
 from sugarscape_g1mt.trader_agents import Trader
 
 random.seed(1)
@@ -66,6 +72,92 @@ def test_carrying_capacity():
     assert t_statistic > 0 and p_value < 0.05
 
 
+def unit_by_unit_trade(self, other):
+    # The recursive rule T from before trades were batched, kept as a reference.
+    mrs_self = self.calculate_MRS(self.sugar, self.spice)
+    mrs_other = other.calculate_MRS(other.sugar, other.spice)
+    welfare_self = self.calculate_welfare(self.sugar, self.spice)
+    welfare_other = other.calculate_welfare(other.sugar, other.spice)
+    if math.isclose(mrs_self, mrs_other):
+        return
+    price = math.sqrt(mrs_self * mrs_other)
+    if mrs_self > mrs_other:
+        sold = self.maybe_sell_spice(other, price, welfare_self, welfare_other)
+    else:
+        sold = other.maybe_sell_spice(self, price, welfare_other, welfare_self)
+    if not sold:
+        return
+    self.prices.append(price)
+    unit_by_unit_trade(self, other)
+
+
+def test_trade_matches_unit_by_unit_rule():
+    model = SugarscapeG1mt()
+    traders = list(model.schedule.agents_by_type[Trader].values())
+    rng = random.Random(0)
+    for _ in range(200):
+        a, b = rng.sample(traders, 2)
+        # Include rich pairs so long trading sessions are covered.
+        a.sugar, a.spice = rng.randint(1, 400), rng.randint(1, 400)
+        b.sugar, b.spice = rng.randint(1, 400), rng.randint(1, 400)
+        a.prices = []
+        expected_a, expected_b = copy.copy(a), copy.copy(b)
+        expected_a.prices = []
+        trades_before = len(model.trade_log)
+        unit_by_unit_trade(expected_a, expected_b)
+
+        volume = a.trade(b)
+
+        assert volume == len(expected_a.prices)
+        assert (a.sugar, a.spice) == (expected_a.sugar, expected_a.spice)
+        assert (b.sugar, b.spice) == (expected_b.sugar, expected_b.spice)
+        assert a.prices == expected_a.prices
+        if volume:
+            trade = model.trade_log.columns(trades_before)
+            assert trade["qty"].tolist() == [volume]
+            assert {trade["seller"][0], trade["buyer"][0]} == {a.unique_id, b.unique_id}
+
+
+def test_trade_log_spill(tmp_path):
+    in_memory = TradeLog(chunk_size=8)
+    spilled = TradeLog(chunk_size=8, spill_dir=tmp_path)
+    for log in (in_memory, spilled):
+        for i in range(30):
+            log.append(i // 4, i % 5, (i + 1) % 5, 1.0 + i, i + 1)
+
+    assert len(list(tmp_path.iterdir())) == 3
+    for name, column in in_memory.columns().items():
+        np.testing.assert_array_equal(column, spilled.columns()[name])
+    assert spilled.edges(2)["qty"].tolist() == [9, 10, 11, 12]
+    assert spilled.volume(7) == 29 + 30
+    adjacency = spilled.adjacency().toarray()
+    assert adjacency.sum() == 2 * sum(range(1, 31))
+    np.testing.assert_array_equal(adjacency, adjacency.T)
+
+
+def test_sweep_resumes(tmp_path):
+    params = {"vision_min": [1, 2], "metabolism_max": 3}
+    output = tmp_path / "sweep.csv"
+    sweep(params, output, iterations=2, max_steps=3, number_processes=1)
+    # simulate an interruption while the last run was being written
+    manifest = output.with_name("sweep.csv.done")
+    manifest.write_text("".join(manifest.read_text().splitlines(True)[:3]))
+    with open(output, "a") as f:
+        f.write("partial,row\n")
+
+    sweep(params, output, iterations=2, max_steps=3, number_processes=1)
+
+    df = pd.read_csv(output)
+    assert sorted(df.RunId.unique()) == [0, 1, 2, 3]
+    assert (df.groupby("RunId").size() == 3).all()
+
+
+def test_checkpoint_resumes_identically():
+    model, restored = assert_checkpoint_resumes_identically(SugarscapeG1mt, steps=10)
+    for name, column in model.trade_log.columns().items():
+        np.testing.assert_array_equal(restored.trade_log.columns()[name], column)
+
+
 # TODO:
 # 1. Reproduce figure IV-12 that the log of average price should decrease over average agent age
 # 2. Reproduce figure IV-13 that the gini coefficient on trade should decrease over mean vision, and should be higher with trade
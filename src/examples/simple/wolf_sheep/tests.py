@@ -0,0 +1,13 @@
+from functools import partial
+
+from examples_shared.checkpoint import assert_checkpoint_resumes_identically
+from wolf_sheep.model import WolfSheep
+
+
+def test_checkpoint_resumes_identically():
+    model, restored = assert_checkpoint_resumes_identically(
+        partial(WolfSheep, grass=True), steps=10
+    )
+    assert sorted((a.unique_id, a.pos, a.energy) for a in restored.agents) == sorted(
+        (a.unique_id, a.pos, a.energy) for a in model.agents
+    )
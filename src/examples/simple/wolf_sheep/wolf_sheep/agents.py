@@ -1,5 +1,3 @@
-import mesa
-
 from .random_walk import RandomWalker
 
 
@@ -28,11 +26,9 @@ class Sheep(RandomWalker):
             self.energy -= 1
 
             # If there is grass available, eat it
-            this_cell = self.model.grid.get_cell_list_contents([self.pos])
-            grass_patch = next(obj for obj in this_cell if isinstance(obj, GrassPatch))
-            if grass_patch.fully_grown:
+            if self.model.grass_fully_grown[self.pos]:
                 self.energy += self.model.sheep_gain_from_food
-                grass_patch.fully_grown = False
+                self.model.grass_fully_grown[self.pos] = False
 
             # Death
             if self.energy < 0:
@@ -67,9 +63,7 @@ class Wolf(RandomWalker):
         self.energy -= 1
 
         # If there are sheep present, eat one
-        x, y = self.pos
-        this_cell = self.model.grid.get_cell_list_contents([self.pos])
-        sheep = [obj for obj in this_cell if isinstance(obj, Sheep)]
+        sheep = self.model.grid.get_cell_agents_of_type(self.pos, Sheep)
         if len(sheep) > 0:
             sheep_to_eat = self.random.choice(sheep)
             self.energy += self.model.wolf_gain_from_food
@@ -91,31 +85,3 @@ class Wolf(RandomWalker):
                 )
                 self.model.grid.place_agent(cub, cub.pos)
                 self.model.schedule.add(cub)
-
-
-class GrassPatch(mesa.Agent):
-    """
-    A patch of grass that grows at a fixed rate and it is eaten by sheep
-    """
-
-    def __init__(self, unique_id, pos, model, fully_grown, countdown):
-        """
-        Creates a new patch of grass
-
-        Args:
-            grown: (boolean) Whether the patch of grass is fully grown or not
-            countdown: Time for the patch of grass to be fully grown again
-        """
-        super().__init__(unique_id, model)
-        self.fully_grown = fully_grown
-        self.countdown = countdown
-        self.pos = pos
-
-    def step(self):
-        if not self.fully_grown:
-            if self.countdown <= 0:
-                # Set as fully grown
-                self.fully_grown = True
-                self.countdown = self.model.grass_regrowth_time
-            else:
-                self.countdown -= 1
@@ -10,9 +10,23 @@ Replication of the model found in NetLogo:
 """
 
 import mesa
+import numpy as np
 
-from .agents import GrassPatch, Sheep, Wolf
+from .agents import Sheep, Wolf
 from .scheduler import RandomActivationByTypeFiltered
+from .space import TypeIndexedMultiGrid
+
+
+def count_wolves(model):
+    return model.schedule.get_type_count(Wolf)
+
+
+def count_sheep(model):
+    return model.schedule.get_type_count(Sheep)
+
+
+def count_grass(model):
+    return model.get_grass_count()
 
 
 class WolfSheep(mesa.Model):
@@ -82,14 +96,12 @@ class WolfSheep(mesa.Model):
         self.sheep_gain_from_food = sheep_gain_from_food
 
         self.schedule = RandomActivationByTypeFiltered(self)
-        self.grid = mesa.space.MultiGrid(self.width, self.height, torus=True)
+        self.grid = TypeIndexedMultiGrid(self.width, self.height, torus=True)
         self.datacollector = mesa.DataCollector(
             {
-                "Wolves": lambda m: m.schedule.get_type_count(Wolf),
-                "Sheep": lambda m: m.schedule.get_type_count(Sheep),
-                "Grass": lambda m: m.schedule.get_type_count(
-                    GrassPatch, lambda x: x.fully_grown
-                ),
+                "Wolves": count_wolves,
+                "Sheep": count_sheep,
+                "Grass": count_grass,
             }
         )
 
@@ -111,9 +123,12 @@ class WolfSheep(mesa.Model):
             self.grid.place_agent(wolf, (x, y))
             self.schedule.add(wolf)
 
-        # Create grass patches
+        # Create the grass layer: one fully_grown flag and one regrowth
+        # countdown per cell.
         if self.grass:
-            for agent, (x, y) in self.grid.coord_iter():
+            self.grass_fully_grown = np.zeros((self.width, self.height), dtype=bool)
+            self.grass_countdown = np.zeros((self.width, self.height), dtype=int)
+            for _, (x, y) in self.grid.coord_iter():
                 fully_grown = self.random.choice([True, False])
 
                 if fully_grown:
@@ -121,15 +136,35 @@ class WolfSheep(mesa.Model):
                 else:
                     countdown = self.random.randrange(self.grass_regrowth_time)
 
-                patch = GrassPatch(self.next_id(), (x, y), self, fully_grown, countdown)
-                self.grid.place_agent(patch, (x, y))
-                self.schedule.add(patch)
+                self.grass_fully_grown[x, y] = fully_grown
+                self.grass_countdown[x, y] = countdown
 
         self.running = True
         self.datacollector.collect(self)
 
+    def get_grass_count(self):
+        """Number of cells with fully grown grass."""
+        if not self.grass:
+            return 0
+        return int(np.count_nonzero(self.grass_fully_grown))
+
+    def grow_grass(self):
+        """
+        Advance the regrowth of every eaten patch of grass by one step.
+
+        A patch whose countdown has run out becomes fully grown again, and its
+        countdown is reset for the next time it is eaten.
+        """
+        growing = ~self.grass_fully_grown
+        regrown = growing & (self.grass_countdown <= 0)
+        self.grass_countdown[growing & ~regrown] -= 1
+        self.grass_countdown[regrown] = self.grass_regrowth_time
+        self.grass_fully_grown |= regrown
+
     def step(self):
         self.schedule.step()
+        if self.grass:
+            self.grow_grass()
         # collect data
         self.datacollector.collect(self)
         if self.verbose:
@@ -138,7 +173,7 @@ class WolfSheep(mesa.Model):
                     self.schedule.time,
                     self.schedule.get_type_count(Wolf),
                     self.schedule.get_type_count(Sheep),
-                    self.schedule.get_type_count(GrassPatch, lambda x: x.fully_grown),
+                    self.get_grass_count(),
                 ]
             )
 
@@ -146,10 +181,7 @@ class WolfSheep(mesa.Model):
         if self.verbose:
             print("Initial number wolves: ", self.schedule.get_type_count(Wolf))
             print("Initial number sheep: ", self.schedule.get_type_count(Sheep))
-            print(
-                "Initial number grass: ",
-                self.schedule.get_type_count(GrassPatch, lambda x: x.fully_grown),
-            )
+            print("Initial number grass: ", self.get_grass_count())
 
         for i in range(step_count):
             self.step()
@@ -158,7 +190,4 @@ class WolfSheep(mesa.Model):
             print("")
             print("Final number wolves: ", self.schedule.get_type_count(Wolf))
             print("Final number sheep: ", self.schedule.get_type_count(Sheep))
-            print(
-                "Final number grass: ",
-                self.schedule.get_type_count(GrassPatch, lambda x: x.fully_grown),
-            )
+            print("Final number grass: ", self.get_grass_count())
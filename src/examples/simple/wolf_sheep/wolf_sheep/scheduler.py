@@ -8,6 +8,8 @@ class RandomActivationByTypeFiltered(mesa.time.RandomActivationByType):
     A scheduler that overrides the get_type_count method to allow for filtering
     of agents by a function before counting.
 
+    Unfiltered counts are the size of the type's AgentSet, so they cost O(1).
+
     Example:
     >>> scheduler = RandomActivationByTypeFiltered(model)
     >>> scheduler.get_type_count(AgentA, lambda agent: agent.some_attribute > 10)
@@ -22,10 +24,13 @@ class RandomActivationByTypeFiltered(mesa.time.RandomActivationByType):
         Returns the current number of agents of certain type in the queue
         that satisfy the filter function.
         """
-        if type_class not in self.agents_by_type:
+        if type_class not in self._agents_by_type:
             return 0
+        agents = self._agents_by_type[type_class]
+        if filter_func is None:
+            return len(agents)
         count = 0
-        for agent in self.agents_by_type[type_class].values():
-            if filter_func is None or filter_func(agent):
+        for agent in agents:
+            if filter_func(agent):
                 count += 1
         return count
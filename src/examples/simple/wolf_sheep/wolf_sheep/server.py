@@ -1,5 +1,6 @@
 import mesa
-from wolf_sheep.agents import GrassPatch, Sheep, Wolf
+import numpy as np
+from wolf_sheep.agents import Sheep, Wolf
 from wolf_sheep.model import WolfSheep
 
 
@@ -23,21 +24,43 @@ def wolf_sheep_portrayal(agent):
         portrayal["text"] = round(agent.energy, 1)
         portrayal["text_color"] = "White"
 
-    elif type(agent) is GrassPatch:
-        if agent.fully_grown:
-            portrayal["Color"] = ["#00FF00", "#00CC00", "#009900"]
-        else:
-            portrayal["Color"] = ["#84e184", "#adebad", "#d6f5d6"]
-        portrayal["Shape"] = "rect"
-        portrayal["Filled"] = "true"
-        portrayal["Layer"] = 0
-        portrayal["w"] = 1
-        portrayal["h"] = 1
+    return portrayal
+
+
+def grass_portrayal(fully_grown):
+    portrayal = {}
+
+    if fully_grown:
+        portrayal["Color"] = ["#00FF00", "#00CC00", "#009900"]
+    else:
+        portrayal["Color"] = ["#84e184", "#adebad", "#d6f5d6"]
+    portrayal["Shape"] = "rect"
+    portrayal["Filled"] = "true"
+    portrayal["Layer"] = 0
+    portrayal["w"] = 1
+    portrayal["h"] = 1
 
     return portrayal
 
 
-canvas_element = mesa.visualization.CanvasGrid(wolf_sheep_portrayal, 20, 20, 500, 500)
+class WolfSheepCanvasGrid(mesa.visualization.CanvasGrid):
+    """
+    A CanvasGrid that also draws the model's grass layer, which is an array
+    rather than agents on the grid.
+    """
+
+    def render(self, model):
+        grid_state = super().render(model)
+        if model.grass:
+            for (x, y), fully_grown in np.ndenumerate(model.grass_fully_grown):
+                portrayal = grass_portrayal(fully_grown)
+                portrayal["x"] = x
+                portrayal["y"] = y
+                grid_state[portrayal["Layer"]].append(portrayal)
+        return grid_state
+
+
+canvas_element = WolfSheepCanvasGrid(wolf_sheep_portrayal, 20, 20, 500, 500)
 chart_element = mesa.visualization.ChartModule(
     [
         {"Label": "Wolves", "Color": "#AA0000"},
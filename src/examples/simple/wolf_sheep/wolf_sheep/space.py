@@ -0,0 +1,62 @@
+"""
+A MultiGrid that indexes its cell contents by agent type.
+"""
+
+from collections import defaultdict
+from typing import List, Type
+
+import mesa
+
+
+class TypeIndexedMultiGrid(mesa.space.MultiGrid):
+    """
+    A MultiGrid that also keeps, for each agent type, the agents of that type
+    in each cell.
+
+    The index is updated by place_agent, move_agent and remove_agent, so
+    looking up e.g. the sheep in a cell does not scan the rest of the cell's
+    contents. Agents are indexed by their exact class, in the order they were
+    placed, so the lookups return the same agents in the same order as
+    filtering get_cell_list_contents with isinstance.
+
+    Example:
+    >>> grid = TypeIndexedMultiGrid(20, 20, torus=True)
+    >>> grid.get_cell_agents_of_type((3, 4), Sheep)
+    """
+
+    def __init__(self, width: int, height: int, torus: bool) -> None:
+        super().__init__(width, height, torus)
+        self._cells_by_type = defaultdict(dict)
+
+    def place_agent(self, agent: mesa.Agent, pos: mesa.space.Coordinate) -> None:
+        super().place_agent(agent, pos)
+        cell = self._cells_by_type[type(agent)].setdefault(pos, [])
+        if agent not in cell:
+            cell.append(agent)
+
+    def remove_agent(self, agent: mesa.Agent) -> None:
+        pos = agent.pos
+        super().remove_agent(agent)
+        cells = self._cells_by_type[type(agent)]
+        cell = cells[pos]
+        cell.remove(agent)
+        if not cell:
+            del cells[pos]
+
+    def get_cell_agents_of_type(
+        self, pos: mesa.space.Coordinate, type_class: Type[mesa.Agent]
+    ) -> List[mesa.Agent]:
+        """
+        Returns the agents of the given type in the cell at pos.
+
+        The list is the grid's own index; do not modify it.
+        """
+        return self._cells_by_type[type_class].get(pos, [])
+
+    def count_agents_of_type(
+        self, pos: mesa.space.Coordinate, type_class: Type[mesa.Agent]
+    ) -> int:
+        """
+        Returns the number of agents of the given type in the cell at pos.
+        """
+        return len(self._cells_by_type[type_class].get(pos, ()))